@@ -0,0 +1,89 @@
+"""
+Concurrent agent requests: the old shared 3-worker pool versus the agent runtime.
+
+Each simulated request waits on the LLM, calls a blocking tool and waits
+on the LLM again, like one ReAct round trip. In the old setup every request
+occupied a thread of the shared `ThreadPoolExecutor(max_workers=3)` for
+its whole duration, and one worker was permanently taken by the listen
+loop. The runtime runs requests as coroutines on one loop thread and only
+hands the tool call to its bounded pool. Reports per-request latency and
+the number of threads each setup used. No network access is needed.
+
+Usage: python benchmarks/bench_agent_runtime.py [requests]
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from src.core.agent_runtime import AgentRuntime
+from src.utils.metrics import metrics
+
+LLM_SECONDS = 0.3
+TOOL_SECONDS = 0.05
+
+
+def blocking_tool():
+    time.sleep(TOOL_SECONDS)
+
+
+def threaded_request():
+    time.sleep(LLM_SECONDS)
+    blocking_tool()
+    time.sleep(LLM_SECONDS)
+
+
+async def async_request():
+    await asyncio.sleep(LLM_SECONDS)
+    await asyncio.get_running_loop().run_in_executor(None, blocking_tool)
+    await asyncio.sleep(LLM_SECONDS)
+
+
+def timed(submit, n):
+    start = time.perf_counter()
+    futures = [submit() for _ in range(n)]
+    latencies = []
+    for future in futures:
+        future.result()
+        latencies.append(time.perf_counter() - start)
+    return np.array(latencies) * 1000
+
+
+def report(name, latencies, threads):
+    print(
+        f"{name:<9} mean {latencies.mean():7.0f} ms  p90 {np.percentile(latencies, 90):7.0f} ms  "
+        f"max {latencies.max():7.0f} ms  threads {threads}"
+    )
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+
+    listening = threading.Event()
+    pool = ThreadPoolExecutor(max_workers=3)
+    pool.submit(listening.wait)  # the listen loop never gives its worker back
+    before = threading.active_count()
+    old = timed(lambda: pool.submit(threaded_request), n)
+    old_threads = threading.active_count() - before + 1
+    listening.set()
+    pool.shutdown()
+
+    before = threading.active_count()
+    runtime = AgentRuntime(max_concurrency=n)
+    new = timed(lambda: runtime.submit(async_request()), n)
+    new_threads = threading.active_count() - before
+    runtime.shutdown()
+
+    print(f"{n} concurrent requests ({LLM_SECONDS * 2000:.0f} ms LLM + {TOOL_SECONDS * 1000:.0f} ms tool each)")
+    report("pool", old, old_threads)
+    report("runtime", new, new_threads)
+
+    tool_wait = metrics.snapshot()["observations"].get("agent.tool.wait")
+    if tool_wait:
+        print(f"runtime tool queue wait mean {tool_wait['mean'] * 1000:.1f} ms, max {tool_wait['max'] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Encode time versus upload size for the transcription codecs.
+
+Encodes each recorded utterance with every codec in src.audio.encoder and
+reports the encode time and the bytes saved relative to 16-bit WAV. Inputs
+are not resampled, so pass 16 kHz mono recordings (e.g. clips saved from the
+listener). Without arguments a synthetic 5 s clip is used.
+
+Usage: python benchmarks/bench_audio_encoder.py [utterance.wav ...]
+"""
+
+import sys
+import time
+import numpy as np
+import soundfile as sf
+from src.audio.encoder import CODECS, encode_audio
+from src.config import config
+
+
+def load_utterances(paths):
+    if not paths:
+        rng = np.random.default_rng(0)
+        t = np.arange(5 * config.SAMPLE_RATE) / config.SAMPLE_RATE
+        voice = np.sin(2 * np.pi * 180 * t) * (0.5 + 0.5 * np.sin(2 * np.pi * 3 * t))
+        clip = 0.3 * voice + 0.01 * rng.standard_normal(len(t))
+        return {"synthetic-5s": (clip * 32767).astype(np.int16)}
+    utterances = {}
+    for path in paths:
+        audio, sr = sf.read(path, dtype="int16")
+        if sr != config.SAMPLE_RATE:
+            print(f"skipping {path}: {sr} Hz, expected {config.SAMPLE_RATE} Hz")
+            continue
+        utterances[path] = audio if audio.ndim == 1 else audio[:, 0]
+    return utterances
+
+
+def main():
+    utterances = load_utterances(sys.argv[1:])
+    totals = {codec: [0.0, 0] for codec in CODECS}
+
+    print(f"{'utterance':<30} {'codec':<6} {'encode ms':>10} {'bytes':>10} {'vs wav':>8}")
+    for name, audio in utterances.items():
+        wav_size = None
+        for codec in CODECS:
+            encode_audio(audio, codec=codec)  # warm up
+            start = time.perf_counter()
+            _, body = encode_audio(audio, codec=codec)
+            elapsed = time.perf_counter() - start
+            wav_size = wav_size or len(body)
+            totals[codec][0] += elapsed
+            totals[codec][1] += len(body)
+            print(
+                f"{name[-30:]:<30} {codec:<6} {elapsed * 1000:>10.2f} {len(body):>10} "
+                f"{len(body) / wav_size:>7.0%}"
+            )
+
+    wav_total = totals["wav"][1]
+    print("\ntotal")
+    for codec, (elapsed, size) in totals.items():
+        print(
+            f"{codec:<6} {elapsed * 1000:>8.2f} ms encode, {size:>10} bytes, "
+            f"{wav_total - size:>10} bytes saved vs wav"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Endpointing across mid-utterance pauses, on synthetic VAD and energy traces.
+
+Each case is speech, a pause, more speech and a trailing silence, at a
+given background noise level. The VAD probability decays over a few
+frames at the end of each phrase, as Silero's does. An endpoint inside the
+pause counts as a truncation (the second phrase is cut off); the latency
+is the silence between the end of the second phrase and the endpoint.
+
+Also replays the listener's streaming-STT segment cut over the same
+traces and reports how many segments were cut at the pause, so a pause
+that closes the recording before the cut shows up as zero segments.
+
+Usage: python benchmarks/bench_endpoint_pauses.py
+"""
+
+import numpy as np
+from src.audio.endpointing import Endpointer
+from src.config import config
+
+FRAME = config.NUM_SAMPLES
+FRAME_MS = 1000 * FRAME / config.SAMPLE_RATE
+SPEECH_RMS = 0.05
+
+
+def frames_for(ms):
+    return round(ms / FRAME_MS)
+
+
+def trace(rng, first_ms, pause_ms, second_ms, noise_rms, tail_ms=2000):
+    """Per-frame (probability, int16 frame) pairs and the index of the last speech frame."""
+    plan = [(frames_for(first_ms), True), (frames_for(pause_ms), False),
+            (frames_for(second_ms), True), (frames_for(tail_ms), False)]
+    probs, frames = [], []
+    for count, speech in plan:
+        for i in range(count):
+            if speech:
+                prob = rng.uniform(0.7, 0.99)
+                rms = SPEECH_RMS
+            else:
+                prob = max(0.02, 0.9 * 0.5 ** (i + 1))  # decays over ~3 frames
+                rms = noise_rms
+            samples = rng.standard_normal(FRAME) * rms
+            frames.append((np.clip(samples, -1, 1) * 32767).astype(np.int16))
+            probs.append(prob)
+    speech_end = plan[0][0] + plan[1][0] + plan[2][0] - 1
+    return probs, frames, speech_end
+
+
+def run(endpointer, probs, frames):
+    """Replay the listener loop: (endpoint index, segments cut)."""
+    pause_frames = min(config.STT_SEGMENT_PAUSE_FRAMES, endpointer.early_frames - 1)
+    segment_start, segment_has_speech, segments = 0, False, 0
+    endpointer.reset()
+    for i, (prob, frame) in enumerate(zip(probs, frames)):
+        done = endpointer.update(prob, endpointer.frame_energy(frame))
+        silence = endpointer.silence_frames
+        if prob > config.CONFIDENCE_THRESHOLD:
+            segment_has_speech = True
+        if segment_has_speech and silence == pause_frames:
+            cut = i + 1 - silence // 2
+            if cut - segment_start >= config.STT_MIN_SEGMENT_FRAMES:
+                segments += 1
+                segment_start, segment_has_speech = cut, False
+        if done:
+            return i, segments
+    return len(probs) - 1, segments
+
+
+def main():
+    rng = np.random.default_rng(0)
+    endpointer = Endpointer()
+    cases = [
+        (first, pause, noise)
+        for first in (2000, 4000)
+        for pause in (384, 512, 640)
+        for noise in (0.001, 0.003, 0.01)
+    ]
+    truncations, latencies, segment_counts = 0, [], []
+    print(f"{'speech':>7} {'pause':>6} {'noise':>6}  {'endpoint':>9}  segments")
+    for first, pause, noise in cases:
+        probs, frames, speech_end = trace(rng, first, pause, 1500, noise)
+        endpoint, segments = run(endpointer, probs, frames)
+        truncated = endpoint < speech_end
+        truncations += truncated
+        latencies.append((endpoint - speech_end) * FRAME_MS)
+        segment_counts.append(segments)
+        outcome = "TRUNCATED" if truncated else f"+{latencies[-1]:.0f} ms"
+        print(f"{first:>5}ms {pause:>4}ms {noise:>6}  {outcome:>9}  {segments}")
+
+    short = []
+    for noise in (0.001, 0.003, 0.01):
+        probs, frames, speech_end = trace(rng, 900, 0, 0, noise)
+        endpoint, _ = run(endpointer, probs, frames)
+        short.append((endpoint - speech_end) * FRAME_MS)
+
+    print(f"\ntruncated {truncations}/{len(cases)}, "
+          f"cases without a segment cut {sum(c == 0 for c in segment_counts)}/{len(cases)}")
+    print(f"latency after the second phrase: mean {np.mean(latencies):.0f} ms, max {np.max(latencies):.0f} ms")
+    print(f"short command latency: mean {np.mean(short):.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Endpointing latency and truncation rate over recorded utterances.
+
+Each file should be a 16 kHz mono recording of one command starting right
+after the wake word. Two seconds of near-silence are appended so every
+strategy can close. The reference end of speech is the last frame the VAD
+scores above the threshold over the whole file (an offline oracle); an
+endpoint before it counts as a truncation, and the latency is the silence
+between the reference end and the endpoint.
+
+Compares the old fixed rule (MAX_SILENCE_FRAMES consecutive silent frames)
+with the adaptive Endpointer.
+
+Usage: python benchmarks/bench_endpointing.py utterance.wav [...]
+"""
+
+import sys
+import numpy as np
+import soundfile as sf
+from src.audio.endpointing import Endpointer
+from src.audio.vad_engine import VADEngine
+from src.config import config
+
+FRAME = config.NUM_SAMPLES
+FRAME_MS = 1000 * FRAME / config.SAMPLE_RATE
+
+
+def load_frames(path):
+    audio, sr = sf.read(path, dtype="int16")
+    if sr != config.SAMPLE_RATE:
+        raise SystemExit(f"{path}: expected {config.SAMPLE_RATE} Hz audio, got {sr} Hz")
+    audio = audio if audio.ndim == 1 else audio[:, 0]
+    rng = np.random.default_rng(0)
+    tail = (rng.standard_normal(2 * config.SAMPLE_RATE) * 30).astype(np.int16)
+    audio = np.concatenate([audio, tail])
+    n = len(audio) // FRAME
+    return list(audio[: n * FRAME].reshape(n, FRAME))
+
+
+def fixed_rule(probs, energies):
+    silence = 0
+    for i, prob in enumerate(probs):
+        silence = 0 if prob > config.CONFIDENCE_THRESHOLD else silence + 1
+        if silence >= config.MAX_SILENCE_FRAMES:
+            return i
+    return len(probs) - 1
+
+
+def adaptive_rule(probs, energies):
+    endpointer = Endpointer()
+    for i, (prob, energy) in enumerate(zip(probs, energies)):
+        if endpointer.update(prob, energy):
+            return i
+    return len(probs) - 1
+
+
+def summarize(name, results):
+    latencies = np.array([lat for lat, _ in results])
+    truncations = sum(truncated for _, truncated in results)
+    print(
+        f"{name:<9} mean {latencies.mean():7.0f} ms  p90 {np.percentile(latencies, 90):7.0f} ms  "
+        f"max {latencies.max():7.0f} ms  truncated {truncations}/{len(results)} "
+        f"({truncations / len(results):.0%})"
+    )
+
+
+def main():
+    if len(sys.argv) < 2:
+        raise SystemExit(__doc__.strip().splitlines()[-1])
+
+    vad = VADEngine()
+    energy_probe = Endpointer()
+    strategies = {"fixed": fixed_rule, "adaptive": adaptive_rule}
+    results = {name: [] for name in strategies}
+
+    for path in sys.argv[1:]:
+        frames = load_frames(path)
+        vad.reset()
+        probs = vad.speech_probs(frames)
+        energies = [energy_probe.frame_energy(frame) for frame in frames]
+        voiced = np.flatnonzero(probs > config.CONFIDENCE_THRESHOLD)
+        if not len(voiced):
+            print(f"skipping {path}: no speech detected")
+            continue
+        speech_end = voiced[-1]
+
+        for name, rule in strategies.items():
+            endpoint = rule(probs, energies)
+            results[name].append(((endpoint - speech_end) * FRAME_MS, endpoint < speech_end))
+
+    if not results["fixed"]:
+        raise SystemExit("No usable utterances")
+    print(f"{len(results['fixed'])} utterances")
+    for name, values in results.items():
+        summarize(name, values)
+
+
+if __name__ == "__main__":
+    main()
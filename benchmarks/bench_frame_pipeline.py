@@ -0,0 +1,110 @@
+"""
+Micro-benchmark for the per-frame listen loop work.
+
+Compares the old path (blocking read copy, int2float, deque copies and a
+struct-unpacked tuple for Porcupine) with the preallocated pipeline
+(ring slot view, in-place float conversion, ctypes-backed Porcupine buffer).
+Porcupine's own native inference is replaced by a no-op so only our side of
+the hot path is measured.
+
+Usage: python benchmarks/bench_frame_pipeline.py [frames]
+"""
+
+import collections
+import ctypes
+import struct
+import sys
+import time
+import tracemalloc
+import numpy as np
+from src.audio.frame_pipeline import FrameConverter, PorcupineFrameAdapter
+
+FRAME_LENGTH = 512
+RING_SLOTS = 937
+
+
+class FakePorcupine:
+    """Mimics pvporcupine's Python wrapper around a native process call."""
+
+    class PicovoiceStatuses:
+        SUCCESS = 0
+
+    frame_length = FRAME_LENGTH
+    _handle = object()
+
+    @staticmethod
+    def _process_func(handle, pcm, result):
+        return 0
+
+    def process(self, pcm):
+        result = ctypes.c_int()
+        self._process_func(self._handle, (ctypes.c_short * len(pcm))(*pcm), ctypes.byref(result))
+        return result.value
+
+
+def int2float(sound):
+    abs_max = np.abs(sound).max()
+    sound = sound.astype("float32")
+    if abs_max > 0:
+        sound *= 1 / 32768
+    return sound.squeeze()
+
+
+def legacy_step(state, source):
+    porcupine, frame_queue, float_queue = state
+    audio_chunk = source.reshape(-1, 1).copy()  # stream.read() returns a fresh array
+    audio_float = int2float(audio_chunk)
+    frame_queue.append(audio_chunk)
+    float_queue.append(audio_float)
+    pcm = struct.unpack_from("h" * porcupine.frame_length, audio_chunk.tobytes())
+    return porcupine.process(pcm)
+
+
+def pipeline_step(state, source):
+    adapter, converter = state
+    keyword_index = adapter.process(source)
+    converter.to_float(source)  # what the VAD consumer does with the same frame
+    return keyword_index
+
+
+def run(name, step, state, frames):
+    for i in range(100):
+        step(state, frames[i % len(frames)])
+
+    start = time.perf_counter_ns()
+    for i in range(len(frames) * 10):
+        step(state, frames[i % len(frames)])
+    ns_per_frame = (time.perf_counter_ns() - start) / (len(frames) * 10)
+
+    tracemalloc.start()
+    allocated = 0
+    for frame in frames:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        step(state, frame)
+        _, peak = tracemalloc.get_traced_memory()
+        allocated += peak - before
+    tracemalloc.stop()
+
+    print(f"{name:<10} {ns_per_frame:>10.0f} ns/frame {allocated / len(frames):>10.0f} B allocated/frame")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rng = np.random.default_rng(0)
+    ring = rng.integers(-8000, 8000, size=(RING_SLOTS, FRAME_LENGTH), dtype=np.int16)
+    slots = list(ring)
+    frames = [slots[i % RING_SLOTS] for i in range(count)]
+
+    legacy_state = (
+        FakePorcupine(), collections.deque(maxlen=60), collections.deque(maxlen=60)
+    )
+    pipeline_state = (PorcupineFrameAdapter(FakePorcupine()), FrameConverter(FRAME_LENGTH))
+
+    print(f"{count} frames of {FRAME_LENGTH} samples")
+    run("before", legacy_step, legacy_state, frames)
+    run("after", pipeline_step, pipeline_state, frames)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Barge-in stop latency of the playback engine against a fake output device.
+
+The fake device calls the engine's callback in real time, one block per
+block period, and "plays" each block during the following period (one
+block of device buffering, reported as its output latency). A writer keeps
+the engine fed with a tone; at random moments `stop()` is called and the
+harness measures:
+
+* call:    how long `stop()` blocks the caller,
+* silence: time from `stop()` until the last audible sample has played.
+
+Both are compared against the 30 ms target for each block size. No audio
+hardware is needed.
+
+Usage: python benchmarks/bench_playback_stop.py [trials]
+"""
+
+import random
+import sys
+import threading
+import time
+import numpy as np
+from src.audio.playback import PlaybackEngine
+from src.config import config
+
+TARGET_MS = 30
+RATE = config.TTS_SAMPLE_RATE
+
+
+class FakeOutputStream:
+    """Drives `callback` like a sound card and logs when audio stops playing."""
+
+    def __init__(self, sample_rate, channels, blocksize, callback):
+        self.sample_rate = sample_rate
+        self.frames = blocksize
+        self.callback = callback
+        self.period = blocksize / sample_rate
+        self.latency = self.period  # the block being played while the next is filled
+        self.buffer = bytearray(blocksize * 2 * channels)
+        self.last_audible_end = 0.0  # when the most recent audible block finishes playing
+        self.running = False
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        deadline = time.perf_counter()
+        while self.running:
+            self.callback(self.buffer, self.frames, None, None)
+            now = time.perf_counter()
+            if any(self.buffer):
+                self.last_audible_end = now + self.latency
+            deadline += self.period
+            time.sleep(max(0.0, deadline - time.perf_counter()))
+
+    def start(self):
+        self.running = True
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        self.thread.join()
+
+    def close(self):
+        pass
+
+
+def tone(seconds):
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (np.sin(2 * np.pi * 220 * t) * 8000).astype(np.int16).tobytes()
+
+
+def run_trials(blocksize, trials):
+    devices = []
+
+    def factory(*args):
+        devices.append(FakeOutputStream(*args))
+        return devices[-1]
+
+    engine = PlaybackEngine(RATE, blocksize=blocksize, stream_factory=factory)
+    device = devices[0]
+    chunk = tone(0.05)
+    calls, silences = [], []
+
+    for _ in range(trials):
+        epoch = engine.epoch
+        writer = threading.Thread(
+            target=lambda: all(engine.write(chunk, epoch) for _ in range(100)), daemon=True
+        )
+        writer.start()
+        time.sleep(random.uniform(0.1, 0.3))
+
+        stopped = time.perf_counter()
+        engine.stop()
+        calls.append(time.perf_counter() - stopped)
+        writer.join()
+        engine.wait_silent(timeout=1.0)
+        time.sleep(3 * device.latency)  # let any block already handed over finish
+        silences.append(max(0.0, device.last_audible_end - stopped))
+
+    engine.close()
+    return np.array(calls) * 1000, np.array(silences) * 1000
+
+
+def main():
+    trials = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    random.seed(0)
+    print(f"{trials} stops per block size, target {TARGET_MS} ms")
+    print(f"{'block':>6} {'block ms':>9} {'call max':>10} {'silence mean':>13} {'p90':>8} {'max':>8}  ok")
+    for blocksize in (128, 256, 512, 1024):
+        calls, silences = run_trials(blocksize, trials)
+        print(
+            f"{blocksize:>6} {1000 * blocksize / RATE:>9.1f} {calls.max():>9.3f}  "
+            f"{silences.mean():>12.1f} {np.percentile(silences, 90):>8.1f} {silences.max():>8.1f}  "
+            f"{'yes' if silences.max() < TARGET_MS else 'no'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Frame-deadline misses of the capture loop under background load.
+
+A simulated capture thread wakes every 32 ms (one 512-sample frame at
+16 kHz), does about a millisecond of wake-word-sized numpy work and
+records how late it finished relative to the frame's deadline. A frame
+that finishes more than MISS_MS late is a miss. It runs three ways:
+
+* idle:      no other load,
+* flat:      CPU-heavy jobs on ordinary threads, all at the same priority
+             (the old shared-executor behaviour),
+* scheduled: the same jobs submitted as background work through the
+             scheduler, with the capture thread in the realtime class.
+
+Raising the capture thread's priority needs CAP_SYS_NICE; without it only
+the background side of the separation applies.
+
+Usage: python benchmarks/bench_scheduler_stress.py [seconds] [jobs]
+"""
+
+import os
+import sys
+import threading
+import time
+import numpy as np
+from src.utils.scheduler import BACKGROUND, REALTIME, Scheduler
+
+FRAME_SECONDS = 512 / 16000
+MISS_MS = 5.0
+
+
+def frame_work(state):
+    # Roughly a Porcupine + VAD frame: a few small matrix products
+    for _ in range(4):
+        state = np.tanh(state @ state.T)[:, :64] * 0.5
+    return state
+
+
+def capture_loop(seconds, lateness):
+    state = np.random.rand(64, 64)
+    deadline = time.perf_counter() + FRAME_SECONDS
+    end = deadline + seconds
+    while deadline < end:
+        time.sleep(max(0.0, deadline - time.perf_counter()))
+        state = frame_work(state)
+        lateness.append(time.perf_counter() - deadline)
+        deadline += FRAME_SECONDS
+
+
+def cpu_job(stop):
+    # numpy releases the GIL, so this competes for the CPU the way model
+    # loads and summarisation calls do
+    a = np.random.rand(300, 300)
+    while not stop.is_set():
+        a = np.tanh(a @ a) * 0.01
+
+
+def run(mode, seconds, jobs):
+    stop = threading.Event()
+    lateness = []
+    scheduler = Scheduler()
+    workers = []
+
+    if mode == "flat":
+        workers = [threading.Thread(target=cpu_job, args=(stop,), daemon=True) for _ in range(jobs)]
+        for worker in workers:
+            worker.start()
+    elif mode == "scheduled":
+        for _ in range(jobs):
+            scheduler.submit(BACKGROUND, cpu_job, stop)
+
+    if mode == "scheduled":
+        capture = scheduler.thread(REALTIME, capture_loop, seconds, lateness)
+    else:
+        capture = threading.Thread(target=capture_loop, args=(seconds, lateness))
+        capture.start()
+    capture.join()
+
+    stop.set()
+    scheduler.shutdown()
+    for worker in workers:
+        worker.join()
+
+    ms = np.array(lateness) * 1000
+    misses = int((ms > MISS_MS).sum())
+    print(
+        f"{mode:<10} frames {len(ms):5d}  late mean {ms.mean():6.2f} ms  p99 {np.percentile(ms, 99):6.2f} ms  "
+        f"max {ms.max():7.2f} ms  misses {misses:4d} ({100 * misses / len(ms):5.1f}%)"
+    )
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    jobs = int(sys.argv[2]) if len(sys.argv) > 2 else 8 * (os.cpu_count() or 1)
+    print(f"{seconds:.0f} s per run, {jobs} CPU jobs, miss = finished > {MISS_MS:.0f} ms after the frame deadline")
+    for mode in ("idle", "flat", "scheduled"):
+        run(mode, seconds, jobs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Synthesis latency of the TTS engines: edge (online) versus piper (CPU).
+
+Synthesises each sentence with every requested engine and reports the
+time to first audio, the total synthesis time and the real-time factor
+(synthesis time / audio duration). The edge engine needs network access;
+the piper engine needs requirements-offline.txt and the voice at
+config.PIPER_VOICE_MODEL.
+
+Usage: python benchmarks/bench_tts_engines.py [edge|piper ...]
+"""
+
+import asyncio
+import sys
+import time
+import numpy as np
+from src.audio.tts_engines import create_tts_engine
+from src.config import config
+
+SENTENCES = [
+    "Okay.",
+    "I've opened the browser for you.",
+    "The weather in Paris is twenty degrees and sunny, with a light wind from the north.",
+    "Sorry, an error occurred while processing your request.",
+]
+
+
+async def measure(engine, text):
+    start = time.perf_counter()
+    first_audio = None
+    total = 0
+    async for _, pcm in engine.stream(text):
+        if first_audio is None:
+            first_audio = time.perf_counter() - start
+        total += len(pcm)
+    elapsed = time.perf_counter() - start
+    return first_audio, elapsed, total / (2 * config.TTS_SAMPLE_RATE)
+
+
+async def bench(name):
+    engine = create_tts_engine(name)
+    engine.warm_up()
+    await measure(engine, "Warm up.")
+    rows = []
+    for text in SENTENCES:
+        first_audio, elapsed, duration = await measure(engine, text)
+        rows.append((first_audio, elapsed, elapsed / duration if duration else 0.0))
+        print(
+            f"{name:<6} {text[:40]:<40} first {first_audio * 1000:7.0f} ms  "
+            f"total {elapsed * 1000:7.0f} ms  audio {duration:5.2f} s  RTF {rows[-1][2]:5.2f}"
+        )
+    return np.array(rows)
+
+
+def main():
+    names = sys.argv[1:] or ["edge", "piper"]
+    summary = {}
+    for name in names:
+        try:
+            summary[name] = asyncio.run(bench(name))
+        except Exception as e:
+            print(f"{name}: unavailable ({e})")
+
+    print()
+    for name, rows in summary.items():
+        print(
+            f"{name:<6} mean first audio {rows[:, 0].mean() * 1000:7.0f} ms  "
+            f"p90 {np.percentile(rows[:, 0], 90) * 1000:7.0f} ms  mean RTF {rows[:, 2].mean():5.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Fixed per-utterance TTS setup overhead: fresh runtime versus persistent one.
+
+The old TTSPlayer paid, for every utterance, a new asyncio loop
+(`asyncio.run`) plus a new PyAudio instance and output stream that were
+torn down afterwards. The persistent runtime submits to one long-lived
+loop thread and writes to a warm playback engine. Both paths are timed
+without any synthesis, so the difference is pure setup cost. Needs an
+output device.
+
+Usage: python benchmarks/bench_tts_setup.py [iterations]
+"""
+
+import asyncio
+import sys
+import time
+import numpy as np
+import pyaudio
+from src.audio.playback import PlaybackEngine
+from src.utils.async_runtime import AsyncLoopThread
+from src.config import config
+
+SILENCE = bytes(2 * 240)  # 10 ms of 16-bit mono at 24 kHz
+
+
+async def noop():
+    return None
+
+
+def fresh_runtime():
+    asyncio.run(noop())
+    p = pyaudio.PyAudio()
+    stream = p.open(format=pyaudio.paInt16, channels=1, rate=config.TTS_SAMPLE_RATE, output=True)
+    stream.write(SILENCE)
+    stream.stop_stream()
+    stream.close()
+    p.terminate()
+
+
+def persistent_runtime(loop, engine):
+    loop.submit(noop()).result()
+    engine.write(SILENCE, engine.epoch)
+
+
+def report(name, samples):
+    samples = np.array(samples) * 1000
+    print(
+        f"{name:<11} mean {samples.mean():7.2f} ms  p50 {np.percentile(samples, 50):7.2f} ms  "
+        f"p90 {np.percentile(samples, 90):7.2f} ms"
+    )
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    fresh = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fresh_runtime()
+        fresh.append(time.perf_counter() - start)
+
+    loop = AsyncLoopThread()
+    loop.start()
+    engine = PlaybackEngine(config.TTS_SAMPLE_RATE)
+    persistent = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        persistent_runtime(loop, engine)
+        persistent.append(time.perf_counter() - start)
+    engine.close()
+    loop.stop()
+
+    print(f"{iterations} utterances (setup only, 10 ms of audio each)")
+    report("fresh", fresh)
+    report("persistent", persistent)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+CPU cost of the Silero VAD backends per second of audio.
+
+Runs the same audio through the torch and ONNX backends of VADEngine and
+reports process CPU time spent per second of audio scored. Uses the given
+16 kHz mono WAV file, or a synthetic noise/tone signal if none is given.
+
+Usage: python benchmarks/bench_vad.py [audio.wav] [--seconds N]
+"""
+
+import argparse
+import time
+import numpy as np
+import soundfile as sf
+from src.audio.vad_engine import VADEngine
+from src.config import config
+
+
+def load_audio(path, seconds):
+    if path:
+        audio, sr = sf.read(path, dtype="int16")
+        if sr != config.SAMPLE_RATE:
+            raise SystemExit(f"{path}: expected {config.SAMPLE_RATE} Hz audio, got {sr} Hz")
+        return audio if audio.ndim == 1 else audio[:, 0]
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * config.SAMPLE_RATE)) / config.SAMPLE_RATE
+    signal = 0.3 * np.sin(2 * np.pi * 220 * t) * (np.sin(2 * np.pi * 0.5 * t) > 0)
+    signal += 0.02 * rng.standard_normal(len(t))
+    return (signal * 32767).astype(np.int16)
+
+
+def bench(backend, frames, seconds):
+    try:
+        engine = VADEngine(backend=backend)
+    except Exception as e:
+        print(f"{backend:<6} unavailable: {e}")
+        return
+    engine.speech_probs(frames[:50])  # warm up
+    engine.reset()
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    engine.speech_probs(frames)
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+    print(
+        f"{backend:<6} {cpu / seconds * 1000:8.2f} ms CPU per audio second "
+        f"({wall / len(frames) * 1e6:7.1f} us/frame wall)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("audio", nargs="?")
+    parser.add_argument("--seconds", type=float, default=30.0)
+    args = parser.parse_args()
+
+    audio = load_audio(args.audio, args.seconds)
+    n = len(audio) // config.NUM_SAMPLES
+    frames = list(audio[: n * config.NUM_SAMPLES].reshape(n, config.NUM_SAMPLES))
+    seconds = n * config.NUM_SAMPLES / config.SAMPLE_RATE
+
+    print(f"{seconds:.1f} s of audio, {n} frames")
+    for backend in ("torch", "onnx"):
+        bench(backend, frames, seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,21 +5,24 @@ This is the main entry point for the DesktopAI assistant with a clean modular ar
 """
 import sys
 import os
+import time
 
 # Add the src directory to Python path for easy imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.core.assistant import call_agent
+from src.core.assistant import call_agent, runtime, schedule_compaction
 from src.audio.audio_processor import AudioProcessor
+from src.audio.streaming_stt import StreamingTranscriber
 from src.utils.logger import get_logger
+from src.utils.metrics import metrics
+from src.utils.scheduler import REALTIME, scheduler
 from src.audio.ttsplayer import TTSPlayer
 from src.ui.overlay import app, overlay
 from src.audio.listener import Listener
+from src.core.turn_pipeline import TurnPipeline
+from src.utils.cancellation import TurnCancelled
 from src.core.tools import register_stop_assistant
 from src.config import config
-from src.utils.thread_executor import executor
-
-import threading
 
 logger = get_logger()
 
@@ -29,7 +32,6 @@ class DesktopAssistant:
     
     def __init__(self):
         """Initialize the assistant with all required components."""
-        self.lock = threading.Lock()
         self._setup_components()
         self._setup_ui()
 
@@ -40,8 +42,23 @@ class DesktopAssistant:
         self.speech.start()
         
         # Audio processing
-        self.audio_processor = AudioProcessor()
-        self.listener = Listener(tts_player=self.speech, overlay=overlay)
+        self.audio_processor = AudioProcessor(runtime)
+        self.stt_stream = (
+            StreamingTranscriber(runtime, self.audio_processor.transcriber)
+            if config.STREAMING_TRANSCRIPTION else None
+        )
+
+        # capture -> STT -> agent -> TTS, each stage on its own thread
+        self.pipeline = TurnPipeline(self.transcribe_turn, self.respond_turn, self.speak_turn)
+        self.pipeline.start()
+
+        # A new wake word cancels whatever the previous turn is still doing
+        self.listener = Listener(
+            tts_player=self.speech,
+            overlay=overlay,
+            stt_stream=self.stt_stream,
+            on_wake=self.pipeline.cancel_active,
+        )
 
     def _setup_ui(self):
         """Setup user interface."""
@@ -49,34 +66,86 @@ class DesktopAssistant:
         overlay.start()
 
     def process_audio(self, audio):
-        """Process incoming audio data."""
-        with self.lock:
-            logger.info("Processing audio...")
-            overlay.put_message("status", "Analyzing voice...", "gold")
-            transcription = self.audio_processor.process_audio(audio)
-            self.process_query(transcription)
+        """Queue recorded audio and return immediately so capture can continue."""
+        self.pipeline.submit_audio(audio)
 
     def process_query(self, query: str):
-        """Process the text query."""
-        overlay.put_message("query", query)
-        logger.debug(f"Invoking agent with: {query}")
+        """Queue a typed query for the agent stage."""
+        self.pipeline.submit_query(query)
+
+    def transcribe_turn(self, turn):
+        """STT stage: turn recorded audio into a query."""
+        logger.info("Processing audio...")
+        overlay.put_message("status", "Analyzing voice...", "gold")
+        turn.query = self.audio_processor.process_audio(turn.audio, turn.token)
+        if not turn.query:
+            overlay.put_message("status", "Active", "green")
+            return None
+        return turn
+
+    def respond_turn(self, turn):
+        """Agent stage: get the assistant's response to the query.
+
+        With STREAM_RESPONSES the answer is shown and spoken while the model
+        is still generating it.
+        """
+        overlay.put_message("query", turn.query)
+        logger.debug(f"Invoking agent with: {turn.query}")
         overlay.put_message("status", "Processing...", "gold")
+        on_delta = None
+        if config.STREAM_RESPONSES:
+            turn.speech = self.speech.open_stream(
+                turn.token, started=turn.created_at, on_done=schedule_compaction
+            )
+            on_delta = lambda delta: self._stream_delta(turn, delta)
         try:
-            response = call_agent(query)
-            logger.info(f"Agent response: {response}")
-            overlay.put_message("response", response)
+            turn.response = call_agent(turn.query, turn.token, on_delta)
+            logger.info(f"Agent response: {turn.response}")
+            overlay.put_message("response", turn.response)
             overlay.put_message("status", "Active", "green")
-            self.speech.speak(response)
+        except TurnCancelled:
+            if turn.speech:
+                turn.speech.cancel()
+            raise
         except Exception as e:
             logger.error(f"Error processing query: {e}")
             overlay.put_message("status", "Error occurred", "red")
-            self.speech.speak("Sorry, an error occurred while processing your request.")
+            turn.response = "Sorry, an error occurred while processing your request."
+            if turn.speech:
+                turn.speech.feed(" " + turn.response)
+        if turn.speech:
+            if not turn.speech.text.strip():
+                # Nothing was streamed, e.g. a tool answered directly
+                turn.speech.feed(turn.response or "")
+            turn.speech.close()
+        return turn
+
+    def _stream_delta(self, turn, delta):
+        if not delta:
+            return
+        if not turn.speech.text:
+            ttft = time.perf_counter() - turn.created_at
+            metrics.observe("turn.time_to_first_token", ttft)
+            logger.info(f"⏱️ Turn time to first token: {ttft * 1000:.0f}ms")
+        turn.speech.feed(delta)
+        overlay.put_message("partial", turn.speech.text)
+
+    def speak_turn(self, turn):
+        """TTS stage: hand the response to the speech player (unless it is already streaming)."""
+        # History is compacted once the answer has been spoken, in the idle
+        # time before the next turn
+        if turn.speech is None:
+            self.speech.speak(turn.response, turn.token, on_done=schedule_compaction)
+        logger.debug(f"Pipeline stats: {self.pipeline.stats()}")
 
     def start(self):
         """Start the assistant."""
         logger.info("🔊 Listening in the background... Say something!")
         overlay.put_message("status", "Active", "green")
-        executor.submit(self.listener.listen, self.process_audio)
+        # Capture and wake word detection get their own high-priority thread
+        self.listener_thread = scheduler.thread(
+            REALTIME, self.listener.listen, self.process_audio, thread_name="listener"
+        )
 
     def shutdown(self):
         """Clean shutdown of the assistant."""
@@ -85,8 +154,10 @@ class DesktopAssistant:
         logger.info("Shutting down...")
         
         self.listener.stop_listening()
+        self.pipeline.shutdown()
         self.speech.shutdown()
-        executor.shutdown(wait=False, cancel_futures=True)
+        runtime.shutdown()
+        scheduler.shutdown()
         overlay.close()
 
 
@@ -1,37 +1,63 @@
 import sounddevice as sd
 import soundfile as sf
-import time, os
+import argparse, time, os
+from src.audio.voiceprint import VoicePrintStore
 from src.utils.logger import get_logger
 from src.config import config
 
 SAMPLE_RATE = config.SAMPLE_RATE
 OWNER_FILE = config.OWNER_VOICE_FILE
+RECORD_SECONDS = 20
 
 logger = get_logger()
 
 
+def sample_path(speaker):
+    """First owner sample keeps the historical path; others get numbered files."""
+    if speaker == "owner" and not os.path.exists(OWNER_FILE):
+        return OWNER_FILE
+    directory = os.path.dirname(OWNER_FILE)
+    index = 1
+    while os.path.exists(os.path.join(directory, f"{speaker}_{index}.wav")):
+        index += 1
+    return os.path.join(directory, f"{speaker}_{index}.wav")
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Record a voice sample and enroll it.")
+    parser.add_argument("--speaker", default="owner", help="Name to enroll the sample under")
+    args = parser.parse_args()
+
     try:
         print(
-            """
-        You'll need to speak for 20 seconds to register your voice.
+            f"""
+        You'll need to speak for {RECORD_SECONDS} seconds to register your voice.
         Please find a quiet place to ensure the best recording quality.
+        Run this again to add more samples; each one improves verification.
         Press Enter to start recording...
         """
         )
         input("Press Enter to start recording...")
         start_time = time.time()
         audio = sd.rec(
-            int(1 * SAMPLE_RATE), samplerate=SAMPLE_RATE, channels=1, dtype="float32"
+            int(RECORD_SECONDS * SAMPLE_RATE), samplerate=SAMPLE_RATE, channels=1, dtype="float32"
         )
-        while int(time.time() - start_time) <= 20:
-            print(f"\rRecording for {20 - (int(time.time() - start_time))} seconds...", end="")
+        while int(time.time() - start_time) <= RECORD_SECONDS:
+            print(f"\rRecording for {RECORD_SECONDS - (int(time.time() - start_time))} seconds...", end="")
             time.sleep(1)
         sd.wait()
         audio = audio.flatten()
 
-        sf.write(OWNER_FILE, audio, SAMPLE_RATE)
-        logger.info(f"\n Saved to {OWNER_FILE}")
+        output_file = sample_path(args.speaker)
+        sf.write(output_file, audio, SAMPLE_RATE)
+        logger.info(f"\n Saved to {output_file}")
+
+        # Embed now so the assistant's cold start doesn't have to
+        from resemblyzer import VoiceEncoder
+
+        store = VoicePrintStore()
+        store.enroll(args.speaker, output_file, VoiceEncoder())
+        logger.info(f"Enrolled '{args.speaker}' ({len(store)} samples in {store.path})")
     except Exception as e:
         logger.error(f"Error during recording: {e}")
         exit(1)
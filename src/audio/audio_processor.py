@@ -1,44 +1,42 @@
 # audio_processor.py
 """Audio processing functionality separated from the main assistant."""
 
-import os
-import numpy as np
-import soundfile as sf
-from groq import Groq
+from src.audio import transcription  # registers the configured transcriber
+from src.audio.streaming_stt import TranscriptSession
+from src.utils.cancellation import TurnCancelled
+from src.utils.model_registry import registry
 from src.utils.logger import get_logger
-from src.config import config
 
 logger = get_logger()
 
 class AudioProcessor:
     """Handles audio transcription and processing."""
-    
-    def __init__(self):
-        self.groq_client = Groq(api_key=config.GROQ_API_KEY)
-    
-    def process_audio(self, audio_data):
-        """Process audio data and return transcription."""
+
+    def __init__(self, runtime):
+        # Requests run on the agent runtime's loop, so cancelling one closes it
+        self.runtime = runtime
+        # Loaded (and warmed up, for local models) once per process
+        self.transcriber = registry.get("transcriber")
+
+    def process_audio(self, audio_data, token=None):
+        """Process audio data (or a streaming transcript session) and return transcription.
+
+        With a cancellation `token` the request is cancelled (TurnCancelled is
+        raised) as soon as the turn is superseded.
+        """
         logger.info("Processing audio...")
-        temp_file = config.TEMP_AUDIO_FILE
-        
+
         try:
-            # Convert audio bytes to numpy array and save as WAV
-            audio_array = np.frombuffer(audio_data, dtype=np.int16)
-            sf.write(temp_file, audio_array, config.SAMPLE_RATE)
-
-            with open(temp_file, "rb") as f:
-                transcription = self.groq_client.audio.transcriptions.create(
-                    file=("temp.wav", f.read()),
-                    model=config.TRANSCRIPTION_MODEL,
-                    response_format="text",
-                    prompt=config.TRANSCRIPTION_PROMPT
-                )
-                logger.info(f"Transcription: {transcription}")
-                return transcription
-                
+            if isinstance(audio_data, TranscriptSession):
+                # Earlier segments were transcribed while the user was speaking
+                text = audio_data.result(token)
+            else:
+                text = self.runtime.run_io(self.transcriber.atranscribe(audio_data), token)
+            logger.info(f"Transcription: {text}")
+            return text
+
+        except TurnCancelled:
+            raise
         except Exception as e:
             logger.error(f"Error processing audio: {e}")
             return None
-        finally:
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
@@ -0,0 +1,159 @@
+# capture.py
+"""Callback-driven microphone capture into a shared int16 ring buffer."""
+
+import threading
+import numpy as np
+import sounddevice as sd
+from src.utils.logger import get_logger
+from src.utils.metrics import metrics
+from src.config import config
+
+logger = get_logger()
+
+
+class RingReader:
+    """An independent read cursor over an `AudioCapture` ring buffer.
+
+    Positions are absolute frame indices, so several consumers (wake word,
+    VAD, speaker verification) can walk the same audio at their own pace.
+    """
+
+    def __init__(self, capture, name, position):
+        self.capture = capture
+        self.name = name
+        self.position = position
+        self.overruns = 0
+
+    def available(self):
+        """Number of frames captured but not yet read by this cursor."""
+        return self.capture.write_position - self.position
+
+    def seek(self, position):
+        """Move the cursor to an absolute frame index."""
+        self.position = position
+
+    def seek_to_end(self):
+        """Skip everything captured so far."""
+        self.position = self.capture.write_position
+
+    def read(self, timeout=None):
+        """Return the next frame, blocking until one is captured.
+
+        The returned array is a view into the ring and stays valid until the
+        producer wraps around (`CAPTURE_BUFFER_SECONDS`). Returns None on
+        timeout or once capture is stopped.
+        """
+        if not self.capture.wait_for(self.position + 1, timeout):
+            return None
+        self._check_overrun()
+        frame = self.capture.frame_at(self.position)
+        self.position += 1
+        return frame
+
+    def read_into(self, out, timeout=None):
+        """Copy the next frame into `out`; return False on timeout or stop."""
+        frame = self.read(timeout)
+        if frame is None:
+            return False
+        np.copyto(out, frame)
+        return True
+
+    def _check_overrun(self):
+        # The slot at `write_position - capacity` is the one the producer
+        # writes next, so the oldest frame still intact is one past it.
+        oldest = self.capture.write_position - self.capture.capacity + 1
+        if self.position >= oldest:
+            return
+        skipped = oldest - self.position
+        self.position = oldest
+        self.overruns += skipped
+        metrics.incr(f"capture.overruns.{self.name}", skipped)
+        logger.warning(f"⚠️ Reader '{self.name}' fell behind, skipped {skipped} frames")
+
+
+class AudioCapture:
+    """Owns the input stream and writes every block into a preallocated ring.
+
+    The PortAudio callback only copies one block into the ring and wakes the
+    readers; it never allocates, so slow consumers cannot make the device drop
+    audio. Consumers that fall a full ring behind are counted as
+    overruns on their own `RingReader`.
+    """
+
+    def __init__(self, sample_rate=None, frame_length=None, buffer_seconds=None):
+        self.sample_rate = sample_rate or config.SAMPLE_RATE
+        self.frame_length = frame_length or config.NUM_SAMPLES
+        buffer_seconds = buffer_seconds or config.CAPTURE_BUFFER_SECONDS
+        self.capacity = max(1, int(buffer_seconds * self.sample_rate) // self.frame_length)
+
+        self.buffer = np.zeros((self.capacity, self.frame_length), dtype=np.int16)
+        # One view per slot, created once so reads don't allocate array objects
+        self.slots = list(self.buffer)
+        self.write_position = 0
+        self.input_overflows = 0
+        self.readers = {}
+        self.running = False
+        self.condition = threading.Condition()
+
+        self.stream = sd.InputStream(
+            channels=config.CHANNELS,
+            samplerate=self.sample_rate,
+            dtype="int16",
+            blocksize=self.frame_length,
+            callback=self._callback,
+        )
+
+    def _callback(self, indata, frames, time_info, status):
+        if status.input_overflow:
+            self.input_overflows += 1
+            metrics.incr("capture.input_overflows")
+        slot = self.slots[self.write_position % self.capacity]
+        slot[:frames] = indata[:, 0]
+        if frames < self.frame_length:
+            slot[frames:] = 0
+        with self.condition:
+            self.write_position += 1
+            self.condition.notify_all()
+
+    def start(self):
+        self.running = True
+        self.stream.start()
+        logger.debug(f"Audio capture started ({self.capacity} frame ring)")
+
+    def stop(self):
+        self.running = False
+        with self.condition:
+            self.condition.notify_all()
+        self.stream.stop()
+        self.stream.close()
+
+    def reader(self, name, position=None):
+        """Create a named cursor, starting at `position` or the live edge."""
+        reader = RingReader(self, name, self.write_position if position is None else position)
+        self.readers[name] = reader
+        return reader
+
+    def wait_for(self, position, timeout=None):
+        """Block until at least `position` frames have been captured."""
+        if self.write_position >= position:
+            return True
+        with self.condition:
+            return self.condition.wait_for(
+                lambda: self.write_position >= position or not self.running, timeout
+            ) and self.write_position >= position
+
+    def frame_at(self, position):
+        return self.slots[position % self.capacity]
+
+    def frames_before(self, position, count):
+        """Copy up to `count` frames ending just before `position` as one int16 array."""
+        count = min(count, position, self.capacity)
+        indices = np.arange(position - count, position) % self.capacity
+        return self.buffer[indices].reshape(-1)
+
+    def stats(self):
+        return {
+            "frames_captured": self.write_position,
+            "input_overflows": self.input_overflows,
+            "reader_overruns": {name: r.overruns for name, r in self.readers.items()},
+        }
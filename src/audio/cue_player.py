@@ -0,0 +1,89 @@
+# cue_player.py
+"""Short UI sound cues mixed into one persistent output stream."""
+
+import collections
+import numpy as np
+import soundfile as sf
+from src.utils.logger import get_logger
+from src.utils.metrics import metrics
+from src.config import config
+
+logger = get_logger()
+
+
+def load_cue(path, sample_rate):
+    """Decode a sound file to mono float32 at `sample_rate`."""
+    samples, sr = sf.read(path, dtype="float32", always_2d=True)
+    samples = samples.mean(axis=1)
+    if sr != sample_rate:
+        import soxr
+
+        samples = soxr.resample(samples, sr, sample_rate)
+    return np.ascontiguousarray(samples, dtype=np.float32)
+
+
+class CuePlayer:
+    """Plays pre-decoded cues without blocking the caller.
+
+    Cues are decoded and resampled to the stream rate once, at load time.
+    The output stream stays open; its callback (on the audio thread) mixes
+    every active cue into the block it is asked for. `play` only appends to
+    a deque, so triggering a cue from the capture path is close to free.
+    """
+
+    def __init__(self, cues=None, sample_rate=None, blocksize=None):
+        self.sample_rate = sample_rate or config.CUE_SAMPLE_RATE
+        self.blocksize = blocksize or config.CUE_BLOCK_SIZE
+        self.cues = {}
+        self.pending = collections.deque()
+        self.active = []  # [samples, offset], touched only by the callback
+        self.stream = None
+        for name, path in (cues or {}).items():
+            self.add(name, path)
+
+    def add(self, name, path):
+        self.cues[name] = load_cue(path, self.sample_rate)
+        logger.debug(f"Loaded cue {name!r} ({len(self.cues[name]) / self.sample_rate:.2f}s)")
+
+    def play(self, name):
+        """Start cue `name`; returns immediately."""
+        self.pending.append(self.cues[name])
+        metrics.incr(f"cues.{name}")
+
+    def _callback(self, outdata, frames, time_info, status):
+        if status.output_underflow:
+            metrics.incr("cues.underflows")
+        while self.pending:
+            self.active.append([self.pending.popleft(), 0])
+
+        out = outdata[:, 0]
+        out.fill(0)
+        still_active = []
+        for cue in self.active:
+            samples, offset = cue
+            chunk = samples[offset : offset + frames]
+            out[: len(chunk)] += chunk
+            cue[1] = offset + len(chunk)
+            if cue[1] < len(samples):
+                still_active.append(cue)
+        self.active = still_active
+        np.clip(out, -1.0, 1.0, out=out)
+
+    def start(self):
+        import sounddevice as sd
+
+        self.stream = sd.OutputStream(
+            samplerate=self.sample_rate,
+            blocksize=self.blocksize,
+            channels=1,
+            dtype="float32",
+            callback=self._callback,
+        )
+        self.stream.start()
+        return self
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
@@ -0,0 +1,38 @@
+# encoder.py
+"""In-memory encoding of recorded utterances for upload."""
+
+import io
+import numpy as np
+import soundfile as sf
+from src.config import config
+
+# codec name -> (soundfile format, subtype, upload filename)
+CODECS = {
+    "wav": ("WAV", "PCM_16", "audio.wav"),
+    "flac": ("FLAC", "PCM_16", "audio.flac"),
+    "opus": ("OGG", "OPUS", "audio.ogg"),
+}
+
+
+def encode_audio(audio, sample_rate=None, codec=None):
+    """Encode int16 mono samples into an in-memory file.
+
+    Args:
+        audio: int16 numpy array (or anything `np.frombuffer` accepts)
+        sample_rate: sample rate of `audio` (defaults to config.SAMPLE_RATE)
+        codec: one of CODECS (defaults to config.TRANSCRIPTION_CODEC)
+
+    Returns:
+        tuple: (filename, bytes) ready to be passed as an upload file
+    """
+    codec = codec or config.TRANSCRIPTION_CODEC
+    if codec not in CODECS:
+        raise ValueError(f"Unknown codec '{codec}', expected one of {sorted(CODECS)}")
+    file_format, subtype, filename = CODECS[codec]
+
+    if not isinstance(audio, np.ndarray):
+        audio = np.frombuffer(audio, dtype=np.int16)
+
+    buffer = io.BytesIO()
+    sf.write(buffer, audio.reshape(-1), sample_rate or config.SAMPLE_RATE, format=file_format, subtype=subtype)
+    return filename, buffer.getvalue()
@@ -0,0 +1,88 @@
+# endpointing.py
+"""Adaptive end-of-utterance detection for voice commands."""
+
+import numpy as np
+from src.audio.frame_pipeline import FrameConverter
+from src.config import config
+
+
+class Endpointer:
+    """Decides when the user has finished speaking.
+
+    Instead of a fixed run of silent frames it combines three signals:
+
+    * the VAD probability trend (a fast moving average must have decayed),
+    * the energy envelope relative to an adaptive noise floor,
+    * the utterance length: short commands get a short hangover, longer
+      dictation tolerates longer thinking pauses.
+
+    For a short command (under `ENDPOINT_SHORT_UTTERANCE_MS` of speech) a
+    pause that is clearly final (probability and energy both back at the
+    floor) closes after `ENDPOINT_EARLY_SILENCE_MS`. Anything longer always
+    waits out the hangover, which grows from `ENDPOINT_MIN_SILENCE_MS` to
+    `ENDPOINT_MAX_SILENCE_MS` with the amount of speech heard, so dictation
+    is not cut at its first natural pause. If no speech arrives at all the
+    recording closes after `MAX_SILENCE_FRAMES`.
+    """
+
+    def __init__(self, frame_length=None, sample_rate=None, threshold=None):
+        frame_length = frame_length or config.NUM_SAMPLES
+        sample_rate = sample_rate or config.SAMPLE_RATE
+        self.frame_ms = 1000 * frame_length / sample_rate
+        self.threshold = config.CONFIDENCE_THRESHOLD if threshold is None else threshold
+        self.converter = FrameConverter(frame_length)
+
+        self.early_frames = self._frames(config.ENDPOINT_EARLY_SILENCE_MS)
+        self.min_frames = self._frames(config.ENDPOINT_MIN_SILENCE_MS)
+        self.max_frames = self._frames(config.ENDPOINT_MAX_SILENCE_MS)
+        self.short_speech_frames = self._frames(config.ENDPOINT_SHORT_UTTERANCE_MS)
+        self.long_speech_frames = self._frames(config.ENDPOINT_LONG_UTTERANCE_MS)
+        self.no_speech_frames = config.MAX_SILENCE_FRAMES
+        self.reset()
+
+    def _frames(self, ms):
+        return max(1, round(ms / self.frame_ms))
+
+    def reset(self):
+        self.speech_frames = 0
+        self.silence_frames = 0
+        self.prob_trend = 0.0
+        self.envelope = 0.0
+        self.noise_floor = None
+
+    def frame_energy(self, frame):
+        """RMS of an int16 frame on the [-1, 1] scale."""
+        samples = self.converter.to_float(frame)
+        return float(np.sqrt(np.dot(samples, samples) / len(samples)))
+
+    def hangover_frames(self):
+        """Silence needed to close, growing with the amount of speech so far."""
+        ratio = min(1.0, self.speech_frames / self.long_speech_frames)
+        return round(self.min_frames + (self.max_frames - self.min_frames) * ratio)
+
+    def update(self, prob, energy):
+        """Feed one frame; return True once the utterance is complete."""
+        self.prob_trend += 0.3 * (prob - self.prob_trend)
+        # Instant attack, ~200 ms release
+        self.envelope = max(energy, self.envelope * 0.6)
+        if self.noise_floor is None or energy < self.noise_floor:
+            self.noise_floor = energy
+
+        if prob > self.threshold:
+            self.speech_frames += 1
+            self.silence_frames = 0
+            return False
+        self.silence_frames += 1
+        # The floor follows the background slowly, and only outside speech
+        self.noise_floor += 0.01 * (energy - self.noise_floor)
+
+        if not self.speech_frames:
+            return self.silence_frames >= self.no_speech_frames
+        if self.silence_frames >= self.hangover_frames():
+            return True
+        if self.speech_frames >= self.short_speech_frames:
+            # The noise floor tracks the quietest frame, so any pause soon
+            # looks "clearly done"; only trust that for short commands
+            return False
+        clearly_done = self.prob_trend < 0.1 and self.envelope < 2 * self.noise_floor + 1e-4
+        return clearly_done and self.silence_frames >= self.early_frames
@@ -0,0 +1,55 @@
+# frame_pipeline.py
+"""Allocation-free per-frame conversions used by the listen loop."""
+
+import ctypes
+import numpy as np
+
+
+class FrameConverter:
+    """Converts int16 frames to float32 into one preallocated buffer.
+
+    The returned array is reused on every call, so consumers must finish with
+    it (or copy it) before converting the next frame.
+    """
+
+    SCALE = np.float32(1 / 32768)
+
+    def __init__(self, frame_length):
+        self.float_frame = np.zeros(frame_length, dtype=np.float32)
+
+    def to_float(self, frame):
+        np.copyto(self.float_frame, frame, casting="unsafe")
+        self.float_frame *= self.SCALE
+        return self.float_frame
+
+
+class PorcupineFrameAdapter:
+    """Feeds Porcupine from a ctypes-backed buffer instead of a Python tuple.
+
+    `Porcupine.process` builds a `c_short` array from a sequence of Python
+    ints on every call. Here the int16 frame is copied into a persistent
+    ctypes array (exposed to numpy as `pcm`) and handed to the native
+    process function directly. Falls back to the public API if the binding
+    does not expose it.
+    """
+
+    def __init__(self, porcupine):
+        self.porcupine = porcupine
+        self._pcm = (ctypes.c_short * porcupine.frame_length)()
+        self.pcm = np.frombuffer(self._pcm, dtype=np.int16)
+        self._result = ctypes.c_int()
+        self._result_ref = ctypes.byref(self._result)
+        self._process = getattr(porcupine, "_process_func", None)
+        self._handle = getattr(porcupine, "_handle", None)
+        self._success = getattr(getattr(porcupine, "PicovoiceStatuses", None), "SUCCESS", None)
+
+    def process(self, frame):
+        """Return the detected keyword index, or -1."""
+        np.copyto(self.pcm, frame)
+        if self._process is None or self._handle is None:
+            return self.porcupine.process(self.pcm)
+        status = self._process(self._handle, self._pcm, self._result_ref)
+        if status is not self._success:
+            # Let the public API raise the library's own exception
+            return self.porcupine.process(self.pcm)
+        return self._result.value
@@ -0,0 +1,53 @@
+# models.py
+"""Registers the shared audio models and devices with the model registry.
+
+Importing this module is cheap: nothing is loaded until a consumer calls
+`registry.get(...)`, and every consumer then shares the same instance.
+"""
+
+from src.utils.model_registry import registry
+from src.config import config
+
+
+def _load_capture():
+    from src.audio.capture import AudioCapture
+
+    capture = AudioCapture()
+    capture.start()
+    return capture
+
+
+def _load_cue_player():
+    from src.audio.cue_player import CuePlayer
+
+    cues = {"start": config.START_SOUND_FILE, "stop": config.STOP_SOUND_FILE}
+    return CuePlayer(cues).start()
+
+
+def _load_porcupine():
+    import pvporcupine
+
+    return pvporcupine.create(
+        access_key=config.PORCUPINE_ACCESS_KEY,
+        keyword_paths=[config.WAKE_WORD_MODEL],
+        sensitivities=[0.95]
+    )
+
+
+def _load_vad():
+    from src.audio.vad_engine import VADEngine
+
+    return VADEngine()
+
+
+def _load_voice_encoder():
+    from resemblyzer import VoiceEncoder
+
+    return VoiceEncoder()
+
+
+registry.register("capture", _load_capture, lambda capture: capture.stop())
+registry.register("cue_player", _load_cue_player, lambda cues: cues.close())
+registry.register("porcupine", _load_porcupine, lambda porcupine: porcupine.delete())
+registry.register("vad", _load_vad)
+registry.register("voice_encoder", _load_voice_encoder)
@@ -0,0 +1,141 @@
+# playback.py
+"""Callback-driven PCM playback with epoch-based interruption."""
+
+import collections
+import threading
+import time
+from src.utils.metrics import metrics
+from src.config import config
+
+
+def sounddevice_stream(sample_rate, channels, blocksize, callback):
+    import sounddevice as sd
+
+    return sd.RawOutputStream(
+        samplerate=sample_rate,
+        blocksize=blocksize,
+        channels=channels,
+        dtype="int16",
+        latency=config.PLAYBACK_LATENCY,
+        callback=callback,
+    )
+
+
+class PlaybackEngine:
+    """Plays 16-bit PCM through one persistent output stream.
+
+    Writers queue audio tagged with the epoch they started in; `stop` bumps
+    the epoch and drops everything queued, so stale writers are rejected
+    and the very next device callback renders silence. Audible latency after
+    `stop` is therefore bounded by one callback block plus the device's own
+    output latency, both tunable (`PLAYBACK_BLOCK_SIZE`, `PLAYBACK_LATENCY`),
+    and `stop` itself never sleeps. Writers are held back once
+    `PLAYBACK_BUFFER_MS` of audio is queued.
+
+    `stream_factory(sample_rate, channels, blocksize, callback)` builds the
+    output stream; tests and benchmarks can pass a fake device.
+    """
+
+    def __init__(self, sample_rate, channels=1, blocksize=None, buffer_ms=None, stream_factory=None):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.frame_bytes = 2 * channels
+        self.blocksize = blocksize or config.PLAYBACK_BLOCK_SIZE
+        buffer_ms = config.PLAYBACK_BUFFER_MS if buffer_ms is None else buffer_ms
+        self.max_buffered = int(sample_rate * buffer_ms / 1000) * self.frame_bytes
+        self.silence = memoryview(bytes(self.blocksize * self.frame_bytes))
+        self.cond = threading.Condition()
+        self.chunks = collections.deque()
+        self.offset = 0  # bytes of chunks[0] already played
+        self.buffered = 0
+        self.epoch = 0
+        self.audible = False  # last block contained queued audio
+        self.stop_requested_at = None
+        self.silenced_at = None
+        self.stream = (stream_factory or sounddevice_stream)(
+            sample_rate, channels, self.blocksize, self._callback
+        )
+        self.stream.start()
+
+    def _callback(self, outdata, frames, time_info, status):
+        needed = frames * self.frame_bytes
+        filled = 0
+        with self.cond:
+            while filled < needed and self.chunks:
+                chunk = self.chunks[0]
+                n = min(len(chunk) - self.offset, needed - filled)
+                outdata[filled : filled + n] = chunk[self.offset : self.offset + n]
+                filled += n
+                self.offset += n
+                if self.offset == len(chunk):
+                    self.chunks.popleft()
+                    self.offset = 0
+            self.buffered -= filled
+            self.audible = filled > 0
+            if self.stop_requested_at is not None:
+                # Audio handed to the device earlier still has to play out
+                self.silenced_at = time.perf_counter() + self.output_latency()
+                metrics.observe("playback.stop_latency", self.silenced_at - self.stop_requested_at)
+                self.stop_requested_at = None
+            self.cond.notify_all()
+        if filled < needed:
+            gap = needed - filled
+            outdata[filled:needed] = self.silence[:gap] if gap <= len(self.silence) else bytes(gap)
+
+    def output_latency(self):
+        return getattr(self.stream, "latency", 0.0) or 0.0
+
+    def write(self, pcm, epoch):
+        """Queue `pcm` for playback in `epoch`.
+
+        Blocks while the queue is full; returns False (dropping the audio)
+        once `epoch` has been superseded by `stop`.
+        """
+        view = memoryview(pcm).cast("B")
+        with self.cond:
+            while self.epoch == epoch and self.buffered >= self.max_buffered:
+                self.cond.wait(0.05)
+            if self.epoch != epoch:
+                return False
+            if len(view):
+                self.chunks.append(view)
+                self.buffered += len(view)
+        return True
+
+    def stop(self, epoch=None):
+        """Drop queued audio and start a new epoch; returns the current epoch.
+
+        With `epoch`, only stops if that epoch is still the current one, so a
+        late cancel of an old utterance cannot cut off a newer one.
+        """
+        with self.cond:
+            if epoch is not None and epoch != self.epoch:
+                return self.epoch
+            playing = self.audible or self.buffered > 0
+            self.epoch += 1
+            self.chunks.clear()
+            self.offset = 0
+            self.buffered = 0
+            if playing:
+                self.stop_requested_at = time.perf_counter()
+                self.silenced_at = None
+            else:
+                self.silenced_at = time.perf_counter()
+            self.cond.notify_all()
+            return self.epoch
+
+    def wait_silent(self, timeout=None):
+        """Wait for the device to go quiet after `stop`; returns when it did (or None)."""
+        with self.cond:
+            self.cond.wait_for(lambda: self.stop_requested_at is None, timeout)
+            return self.silenced_at
+
+    def drain(self, epoch, timeout=None):
+        """Wait until everything queued in `epoch` has been handed to the device."""
+        with self.cond:
+            return self.cond.wait_for(lambda: self.epoch != epoch or not self.buffered, timeout)
+
+    def close(self):
+        self.stop()
+        self.stream.stop()
+        self.stream.close()
@@ -0,0 +1,121 @@
+# speaker_verifier.py
+"""Background speaker verification over the capture ring's pre-roll window."""
+
+import collections
+import threading
+import time
+import numpy as np
+from src.audio.frame_pipeline import FrameConverter
+from src.utils.logger import get_logger
+from src.utils.metrics import metrics
+from src.config import config
+
+logger = get_logger()
+
+
+class RollingSpeakerVerifier(threading.Thread):
+    """Keeps a speaker verdict for the most recent audio up to date.
+
+    While there is speech energy on the microphone, a partial embedding of
+    the last `SPEAKER_PARTIAL_FRAMES` frames is computed every
+    `SPEAKER_HOP_FRAMES`. The partials covering the pre-roll window are
+    averaged (as Resemblyzer does for a full utterance) and matched against
+    the voice print store, so when the wake word fires the verdict usually
+    already exists. `verify()` falls back to embedding the window on the spot
+    when the background stage has no fresh result.
+    """
+
+    def __init__(self, capture, voice_encoder, voiceprints):
+        super().__init__(daemon=True)
+        self.capture = capture
+        self.voice_encoder = voice_encoder
+        self.voiceprints = voiceprints
+        self.reader = capture.reader("speaker")
+        self.converter = FrameConverter(capture.frame_length)
+
+        self.window_frames = config.PRE_ROLL_FRAMES
+        self.partial_frames = config.SPEAKER_PARTIAL_FRAMES
+        self.hop_frames = config.SPEAKER_HOP_FRAMES
+        self.max_lag_frames = config.SPEAKER_MAX_LAG_FRAMES
+        self.energy_threshold = config.SPEAKER_ENERGY_THRESHOLD
+
+        # (end_position, embedding) of recent partials, newest last
+        self.partials = collections.deque(maxlen=self.window_frames // self.hop_frames + 1)
+        self.lock = threading.Lock()
+        self.encoder_lock = threading.Lock()
+        self.running = False
+        self.sync_embed_seconds = None  # measured cost of an on-the-spot verification
+
+    def run(self):
+        self.running = True
+        voiced_frames = 0
+        hop_position = 0
+        while self.running:
+            frame = self.reader.read(timeout=0.5)
+            if frame is None:
+                continue
+            samples = self.converter.to_float(frame)
+            if float(np.dot(samples, samples)) / len(samples) > self.energy_threshold ** 2:
+                voiced_frames += 1
+
+            hop_position += 1
+            if hop_position < self.hop_frames:
+                continue
+            hop_position = 0
+            if voiced_frames:
+                self._add_partial(self.reader.position)
+            voiced_frames = 0
+
+    def _embed(self, end_position, frames):
+        audio = self.capture.frames_before(end_position, frames).astype(np.float32) / 32768
+        with self.encoder_lock:
+            return self.voice_encoder.embed_utterance(audio)
+
+    def _add_partial(self, end_position):
+        embedding = self._embed(end_position, self.partial_frames)
+        with self.lock:
+            self.partials.append((end_position, embedding))
+
+    def _rolling_embedding(self, position):
+        """Mean of the partials covering the window ending at `position`, or None."""
+        with self.lock:
+            if not self.partials or self.partials[-1][0] < position - self.max_lag_frames:
+                return None
+            # Partials that lie (almost) entirely inside the window
+            first_end = position - self.window_frames + self.partial_frames
+            last_end = position + self.max_lag_frames
+            embeddings = [e for end, e in self.partials if first_end <= end <= last_end]
+        if not embeddings:
+            return None
+        embedding = np.mean(embeddings, axis=0)
+        return embedding / max(np.linalg.norm(embedding), 1e-9)
+
+    def verify(self, wake_position):
+        """Return `(speaker, similarity)` for the audio leading up to the wake word."""
+        start = time.perf_counter()
+        embedding = self._rolling_embedding(wake_position)
+        if embedding is not None:
+            speaker, similarity = self.voiceprints.match(embedding)
+            latency = time.perf_counter() - start
+            metrics.incr("speaker.rolling_hits")
+            metrics.observe("speaker.verify_latency", latency)
+            if self.sync_embed_seconds is not None:
+                metrics.observe("speaker.latency_saved", self.sync_embed_seconds - latency)
+                logger.debug(
+                    f"Speaker verdict ready in {latency * 1000:.1f}ms "
+                    f"(saved ~{(self.sync_embed_seconds - latency) * 1000:.0f}ms)"
+                )
+            return speaker, similarity
+
+        # No fresh background result (e.g. first words after silence): embed now
+        embedding = self._embed(wake_position, self.window_frames)
+        speaker, similarity = self.voiceprints.match(embedding)
+        latency = time.perf_counter() - start
+        self.sync_embed_seconds = latency
+        metrics.incr("speaker.rolling_misses")
+        metrics.observe("speaker.verify_latency", latency)
+        logger.debug(f"Speaker verdict computed on wake in {latency * 1000:.0f}ms")
+        return speaker, similarity
+
+    def stop(self):
+        self.running = False
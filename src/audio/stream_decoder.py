@@ -0,0 +1,51 @@
+# stream_decoder.py
+"""Incremental in-process MP3 decoding for streamed TTS audio."""
+
+import av
+
+
+class Mp3StreamDecoder:
+    """Decodes MP3 bytes as they arrive into 16-bit mono PCM at a fixed rate.
+
+    `decode` accepts arbitrary slices of the byte stream (the parser finds
+    frame boundaries) and returns whatever PCM is complete so far, so
+    playback can start after the first few hundred bytes instead of after
+    the whole file. Call `flush` once the stream ends.
+    """
+
+    sample_width = 2
+    channels = 1
+
+    def __init__(self, sample_rate):
+        self.sample_rate = sample_rate
+        self.codec = av.CodecContext.create("mp3", "r")
+        self.resampler = av.AudioResampler(format="s16", layout="mono", rate=sample_rate)
+
+    def _convert(self, frames):
+        pcm = bytearray()
+        for frame in frames:
+            for out in self.resampler.resample(frame):
+                pcm += out.to_ndarray().tobytes()
+        return bytes(pcm)
+
+    def _decode_packets(self, packets):
+        frames = []
+        for packet in packets:
+            try:
+                frames.extend(self.codec.decode(packet))
+            except av.error.InvalidDataError:
+                continue  # e.g. an ID3 tag or a truncated frame; skip it
+        return frames
+
+    def decode(self, data):
+        """Feed a chunk of MP3 bytes; return the PCM decoded from it (may be empty)."""
+        return self._convert(self._decode_packets(self.codec.parse(data)))
+
+    def flush(self):
+        """Drain the parser, decoder and resampler at the end of the stream."""
+        frames = self._decode_packets(self.codec.parse(None))
+        frames.extend(self.codec.decode(None))
+        pcm = self._convert(frames)
+        for out in self.resampler.resample(None):
+            pcm += out.to_ndarray().tobytes()
+        return pcm
@@ -0,0 +1,89 @@
+# streaming_stt.py
+"""Incremental transcription of an utterance while it is still being recorded."""
+
+import asyncio
+import time
+from src.utils.cancellation import TurnCancelled
+from src.utils.logger import get_logger
+from src.utils.metrics import metrics
+from src.utils.model_registry import registry
+from src.config import config
+
+logger = get_logger()
+
+
+class TranscriptSession:
+    """Segments of one utterance, transcribed in the background as they close.
+
+    The listener cuts the recording at VAD pauses and hands each finished
+    segment to `add_segment`; `finish` adds the last one. `result` stitches
+    the segment transcripts in order, so only the final segment is still
+    in flight when recording stops. Segments are transcribed as coroutines
+    on the agent runtime's loop, at most STT_MAX_PARALLEL_SEGMENTS at once.
+    """
+
+    def __init__(self, transcriber, runtime, slots):
+        self.transcriber = transcriber
+        self.runtime = runtime
+        self.slots = slots
+        self.futures = []
+        self.audio = None
+        self.finished_at = None
+
+    async def _transcribe(self, audio):
+        async with self.slots:
+            return await self.transcriber.atranscribe(audio)
+
+    def add_segment(self, audio):
+        # The segment is copied out of the capture ring, so it is safe to keep
+        self.futures.append(self.runtime.submit_io(self._transcribe(audio)))
+        logger.debug(f"Queued segment {len(self.futures)} ({len(audio) / config.SAMPLE_RATE:.2f}s)")
+
+    def finish(self, last_segment, audio):
+        """Queue the final segment (if it has speech) and keep the full utterance."""
+        if last_segment is not None and len(last_segment):
+            self.add_segment(last_segment)
+        self.audio = audio
+        self.finished_at = time.perf_counter()
+
+    def result(self, token=None):
+        """Stitched transcript of all segments; falls back to one request on error.
+
+        If `token` is cancelled, pending and in-flight segment requests are
+        cancelled and TurnCancelled is raised instead of waiting for them.
+        """
+        if token:
+            token.on_cancel(self.cancel)
+            wait = token.result
+        else:
+            wait = lambda future: future.result()
+        try:
+            texts = [(wait(future) or "").strip() for future in self.futures]
+        except TurnCancelled:
+            raise
+        except Exception as e:
+            logger.error(f"Segment transcription failed, transcribing whole utterance: {e}")
+            text = self.runtime.run_io(self.transcriber.atranscribe(self.audio), token)
+            texts = [(text or "").strip()]
+
+        if self.finished_at is not None:
+            metrics.observe("stt.stream.tail_latency", time.perf_counter() - self.finished_at)
+        metrics.observe("stt.stream.segments", len(self.futures))
+        return " ".join(text for text in texts if text)
+
+    def cancel(self):
+        """Cancel segment requests that are queued or in flight."""
+        for future in self.futures:
+            future.cancel()
+
+
+class StreamingTranscriber:
+    """Creates transcript sessions that share one backend and concurrency limit."""
+
+    def __init__(self, runtime, transcriber=None):
+        self.runtime = runtime
+        self.transcriber = transcriber or registry.get("transcriber")
+        self.slots = asyncio.Semaphore(config.STT_MAX_PARALLEL_SEGMENTS)
+
+    def begin(self):
+        return TranscriptSession(self.transcriber, self.runtime, self.slots)
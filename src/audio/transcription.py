@@ -0,0 +1,120 @@
+# transcription.py
+"""Speech-to-text backends selected by `config.TRANSCRIPTION_MODEL`.
+
+Model names starting with `local/` (e.g. `local/base.en`) run faster-whisper
+in-process on the CPU; any other name is sent to the Groq transcription API.
+Transcription is a coroutine meant for the agent runtime's event loop, so
+cancelling a superseded request closes its HTTP connection.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from src.audio.encoder import encode_audio
+from src.utils.logger import get_logger
+from src.utils.metrics import metrics
+from src.utils.model_registry import registry
+from src.config import config
+
+logger = get_logger()
+
+LOCAL_PREFIX = "local/"
+
+
+class Transcriber:
+    """Base class for transcription backends.
+
+    Subclasses implement the coroutine `_atranscribe(audio)` for int16 mono
+    audio at config.SAMPLE_RATE; `atranscribe` adds real-time-factor
+    reporting.
+    """
+
+    name = "base"
+
+    async def _atranscribe(self, audio):
+        raise NotImplementedError
+
+    async def atranscribe(self, audio):
+        audio = np.frombuffer(audio, dtype=np.int16) if not isinstance(audio, np.ndarray) else audio
+        duration = len(audio) / config.SAMPLE_RATE
+        start = time.perf_counter()
+        text = await self._atranscribe(audio)
+        elapsed = time.perf_counter() - start
+
+        rtf = elapsed / duration if duration else 0.0
+        metrics.observe(f"stt.{self.name}.seconds", elapsed)
+        metrics.observe(f"stt.{self.name}.rtf", rtf)
+        logger.debug(f"[{self.name}] Transcribed {duration:.2f}s of audio in {elapsed:.2f}s (RTF {rtf:.2f})")
+        return text
+
+
+class GroqTranscriber(Transcriber):
+    """Whisper on the Groq API; the utterance is encoded in memory and uploaded."""
+
+    name = "groq"
+
+    def __init__(self, model):
+        from groq import AsyncGroq
+
+        self.model = model
+        self.client = AsyncGroq(api_key=config.GROQ_API_KEY)
+
+    async def _atranscribe(self, audio):
+        filename, body = encode_audio(audio, config.SAMPLE_RATE, config.TRANSCRIPTION_CODEC)
+        logger.debug(f"Uploading {len(body)} bytes ({config.TRANSCRIPTION_CODEC})")
+        return await self.client.audio.transcriptions.create(
+            file=(filename, body),
+            model=self.model,
+            response_format="text",
+            prompt=config.TRANSCRIPTION_PROMPT
+        )
+
+
+class LocalWhisperTranscriber(Transcriber):
+    """Quantised faster-whisper on the CPU, loaded once and kept warm.
+
+    Decoding is CPU-bound, so it runs on a small pool of its own rather than
+    on the event loop; a cancelled request finishes there and is discarded.
+    """
+
+    name = "local"
+
+    def __init__(self, model):
+        from faster_whisper import WhisperModel
+
+        self.pool = ThreadPoolExecutor(
+            max_workers=config.STT_MAX_PARALLEL_SEGMENTS, thread_name_prefix="stt-local"
+        )
+        self.model = WhisperModel(
+            model,
+            device="cpu",
+            compute_type=config.LOCAL_WHISPER_COMPUTE_TYPE,
+            cpu_threads=config.LOCAL_WHISPER_THREADS,
+            download_root=config.LOCAL_WHISPER_DIR,
+        )
+        # One throwaway pass so the first real utterance doesn't pay for lazy init
+        self._transcribe(np.zeros(config.SAMPLE_RATE, dtype=np.int16))
+
+    def _transcribe(self, audio):
+        segments, _ = self.model.transcribe(
+            audio.astype(np.float32) / 32768,
+            language="en",
+            beam_size=1,
+            initial_prompt=config.TRANSCRIPTION_PROMPT,
+            condition_on_previous_text=False,
+        )
+        return " ".join(segment.text.strip() for segment in segments)
+
+    async def _atranscribe(self, audio):
+        return await asyncio.get_running_loop().run_in_executor(self.pool, self._transcribe, audio)
+
+
+def create_transcriber(model=None):
+    model = model or config.TRANSCRIPTION_MODEL
+    if model.startswith(LOCAL_PREFIX):
+        return LocalWhisperTranscriber(model[len(LOCAL_PREFIX):])
+    return GroqTranscriber(model)
+
+
+registry.register("transcriber", create_transcriber)
@@ -0,0 +1,151 @@
+# tts_cache.py
+"""Content-addressed cache of synthesised speech."""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from src.utils.logger import get_logger
+from src.utils.metrics import metrics
+from src.config import config
+
+logger = get_logger()
+
+
+class TTSCache:
+    """Decoded PCM for phrases that have already been synthesised.
+
+    Entries are keyed by a hash of (text, engine voice, sample rate); the
+    voice identifies engine, speaker and speed, so a change of any of them
+    never replays stale audio. A size-bounded LRU
+    in memory sits in front of a directory of raw PCM files with its own
+    byte budget; disk hits are promoted to memory and evicted files are the
+    least recently used (by mtime, refreshed on every hit).
+    """
+
+    def __init__(self, directory=None, memory_bytes=None, disk_bytes=None):
+        self.directory = directory or config.TTS_CACHE_DIR
+        self.memory_budget = config.TTS_CACHE_MEMORY_BYTES if memory_bytes is None else memory_bytes
+        self.disk_budget = config.TTS_CACHE_DISK_BYTES if disk_bytes is None else disk_bytes
+        self.lock = threading.Lock()
+        self.memory = OrderedDict()  # key -> pcm bytes
+        self.memory_size = 0
+        self.disk = OrderedDict()  # key -> file size, oldest first
+        self.disk_size = 0
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self._scan()
+
+    @staticmethod
+    def key(text, voice):
+        parts = (text.strip(), voice, str(config.TTS_SAMPLE_RATE))
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pcm")
+
+    def _scan(self):
+        if not self.directory or not os.path.isdir(self.directory):
+            return
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".pcm"):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, name[:-4], stat.st_size))
+        for _, key, size in sorted(entries):
+            self.disk[key] = size
+            self.disk_size += size
+
+    def _remember(self, key, pcm):
+        if len(pcm) > self.memory_budget:
+            return
+        if key in self.memory:
+            self.memory_size -= len(self.memory.pop(key))
+        self.memory[key] = pcm
+        self.memory_size += len(pcm)
+        while self.memory_size > self.memory_budget:
+            _, evicted = self.memory.popitem(last=False)
+            self.memory_size -= len(evicted)
+
+    def _read_disk(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                pcm = f.read()
+            os.utime(path)
+        except OSError:
+            self.disk_size -= self.disk.pop(key, 0)
+            return None
+        self.disk.move_to_end(key)
+        return pcm
+
+    def _write_disk(self, key, pcm):
+        if not self.directory or len(pcm) > self.disk_budget:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(pcm)
+        os.replace(tmp_path, path)
+        self.disk_size += len(pcm) - self.disk.pop(key, 0)
+        self.disk[key] = len(pcm)
+        while self.disk_size > self.disk_budget:
+            evicted, size = self.disk.popitem(last=False)
+            self.disk_size -= size
+            try:
+                os.remove(self._path(evicted))
+            except OSError:
+                pass
+
+    def get(self, text, voice):
+        """Cached PCM for `text` spoken by `voice`, or None."""
+        key = self.key(text, voice)
+        with self.lock:
+            pcm = self.memory.get(key)
+            if pcm is not None:
+                self.memory.move_to_end(key)
+            elif key in self.disk:
+                pcm = self._read_disk(key)
+                if pcm is not None:
+                    self._remember(key, pcm)
+            if pcm is None:
+                self.misses += 1
+                metrics.incr("tts.cache.misses")
+                return None
+            self.hits += 1
+            self.bytes_saved += len(pcm)
+        metrics.incr("tts.cache.hits")
+        metrics.incr("tts.cache.bytes_saved", len(pcm))
+        return pcm
+
+    def put(self, text, pcm, voice):
+        if not pcm:
+            return
+        key = self.key(text, voice)
+        with self.lock:
+            self._remember(key, pcm)
+            try:
+                self._write_disk(key, pcm)
+            except OSError as e:
+                logger.warning(f"Could not write TTS cache entry: {e}")
+
+    def has(self, text, voice):
+        key = self.key(text, voice)
+        with self.lock:
+            return key in self.memory or key in self.disk
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "bytes_saved": self.bytes_saved,
+                "memory_bytes": self.memory_size,
+                "disk_bytes": self.disk_size,
+                "memory_entries": len(self.memory),
+                "disk_entries": len(self.disk),
+            }
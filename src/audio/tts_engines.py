@@ -0,0 +1,234 @@
+# tts_engines.py
+"""Text-to-speech engines selected by `config.TTS_ENGINE`.
+
+`edge` streams from the Microsoft Edge online service, `piper` runs a Piper
+voice in-process on the CPU, and `auto` prefers edge but switches to piper
+whenever the network engine fails or misses its first-audio budget.
+Every engine produces 16-bit mono PCM at `config.TTS_SAMPLE_RATE`.
+"""
+
+import asyncio
+import importlib.util
+import os
+import time
+from src.audio.stream_decoder import Mp3StreamDecoder
+from src.utils.logger import get_logger
+from src.utils.metrics import metrics
+from src.utils.model_registry import registry
+from src.config import config
+
+logger = get_logger()
+
+
+class TTSEngine:
+    """Base class for TTS engines.
+
+    Subclasses implement the async generator `_stream(text)` yielding PCM
+    chunks as soon as they are available; `stream` yields `(voice, pcm)`
+    pairs and reports first-audio latency and real-time factor. `voice`
+    identifies the sound of the output, e.g. for cache keys.
+    """
+
+    name = "base"
+    voice = None
+
+    def warm_up(self):
+        """Load anything expensive ahead of the first request (blocking)."""
+
+    async def _stream(self, text):
+        raise NotImplementedError
+        yield
+
+    async def stream(self, text):
+        start = time.perf_counter()
+        first_audio = None
+        total = 0
+        async for pcm in self._stream(text):
+            if first_audio is None:
+                first_audio = time.perf_counter() - start
+                metrics.observe(f"tts.{self.name}.first_audio", first_audio)
+            total += len(pcm)
+            yield self.voice, pcm
+
+        elapsed = time.perf_counter() - start
+        duration = total / (2 * config.TTS_SAMPLE_RATE)
+        rtf = elapsed / duration if duration else 0.0
+        metrics.observe(f"tts.{self.name}.rtf", rtf)
+        logger.debug(f"[{self.name}] Synthesised {duration:.2f}s of audio in {elapsed:.2f}s (RTF {rtf:.2f})")
+
+
+class EdgeTTSEngine(TTSEngine):
+    """Microsoft Edge online voices, decoded from the MP3 stream as it arrives."""
+
+    name = "edge"
+
+    def __init__(self, voice=None, rate=None):
+        self.edge_voice = voice or config.TTS_VOICE
+        self.rate = rate or config.TTS_RATE
+        self.voice = f"edge:{self.edge_voice}:{self.rate}"
+
+    def _communicate(self, text):
+        import edge_tts
+
+        return edge_tts.Communicate(text=text, voice=self.edge_voice, rate=self.rate)
+
+    async def _stream(self, text):
+        decoder = Mp3StreamDecoder(config.TTS_SAMPLE_RATE)
+        async for chunk in self._communicate(text).stream():
+            if chunk["type"] == "audio":
+                pcm = decoder.decode(chunk["data"])
+                if pcm:
+                    yield pcm
+        pcm = decoder.flush()
+        if pcm:
+            yield pcm
+
+    async def synthesize_to_file(self, text: str, filename: str):
+        """Save the service's MP3 output for `text` to `filename`."""
+        with open(filename, "wb") as f:
+            async for chunk in self._communicate(text).stream():
+                if chunk["type"] == "audio":
+                    f.write(chunk["data"])
+
+
+class PiperTTSEngine(TTSEngine):
+    """A Piper voice on the CPU; works offline.
+
+    The voice model is loaded once through the model registry. Piper
+    synthesises sentence by sentence; each sentence is resampled to
+    TTS_SAMPLE_RATE and yielded while the next one is computed on a worker
+    thread, so the event loop is never blocked.
+    """
+
+    name = "piper"
+
+    def __init__(self, model_path=None):
+        self.model_path = model_path or config.PIPER_VOICE_MODEL
+        self.voice = f"piper:{self.model_path}"
+
+    def warm_up(self):
+        registry.get("piper_voice")
+
+    def _synthesize(self, text):
+        import numpy as np
+        import soxr
+
+        from piper import SynthesisConfig
+
+        piper_voice = registry.get("piper_voice")
+        syn_config = SynthesisConfig(length_scale=config.PIPER_LENGTH_SCALE)
+        for chunk in piper_voice.synthesize(text, syn_config):
+            if chunk.sample_rate == config.TTS_SAMPLE_RATE:
+                yield chunk.audio_int16_bytes
+                continue
+            samples = soxr.resample(chunk.audio_float_array, chunk.sample_rate, config.TTS_SAMPLE_RATE)
+            yield (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16).tobytes()
+
+    async def _stream(self, text):
+        sentences = self._synthesize(text)
+        while True:
+            pcm = await asyncio.to_thread(next, sentences, None)
+            if pcm is None:
+                return
+            yield pcm
+
+
+class AutoTTSEngine(TTSEngine):
+    """Uses `primary` while it is fast enough, otherwise `fallback`.
+
+    The primary engine's first-audio latency is tracked as a moving
+    average. If it fails or misses `budget` seconds on a segment, that
+    segment is synthesised with the fallback instead; after that, or once
+    the average drifts past 75% of the budget, the primary is only retried
+    after `retry_seconds`.
+    """
+
+    name = "auto"
+
+    def __init__(self, primary, fallback, budget=None, retry_seconds=None):
+        self.primary = primary
+        self.fallback = fallback
+        self.budget = (config.TTS_NETWORK_BUDGET_MS if budget is None else budget) / 1000
+        self.retry_seconds = config.TTS_ENGINE_RETRY_SECONDS if retry_seconds is None else retry_seconds
+        self.latency = None  # moving average of the primary's first-audio latency
+        self.demoted_until = 0.0
+
+    @property
+    def voice(self):
+        return self.preferred().voice
+
+    def warm_up(self):
+        # The fallback is needed exactly when there is no time to load it
+        self.primary.warm_up()
+        self.fallback.warm_up()
+
+    def preferred(self):
+        return self.fallback if time.monotonic() < self.demoted_until else self.primary
+
+    def _demote(self, reason):
+        logger.warning(f"⚠️ {self.primary.name} TTS {reason}; using {self.fallback.name} for {self.retry_seconds}s")
+        metrics.incr("tts.auto.fallbacks")
+        self.demoted_until = time.monotonic() + self.retry_seconds
+
+    async def _stream_primary(self, text):
+        """Yield from the primary; raises TimeoutError if it cannot start in time."""
+        start = time.perf_counter()
+        chunks = self.primary.stream(text)
+        try:
+            first = await asyncio.wait_for(chunks.__anext__(), self.budget)
+        except StopAsyncIteration:
+            return
+        except asyncio.TimeoutError:
+            await chunks.aclose()
+            self._demote(f"missed its {self.budget * 1000:.0f}ms budget")
+            raise
+        latency = time.perf_counter() - start
+        self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+        if self.latency > 0.75 * self.budget:
+            self._demote(f"is averaging {self.latency * 1000:.0f}ms to first audio")
+        yield first
+        async for item in chunks:
+            yield item
+
+    async def stream(self, text):
+        if self.preferred() is self.primary:
+            started = False
+            try:
+                async for item in self._stream_primary(text):
+                    started = True
+                    yield item
+                return
+            except Exception as e:
+                if started:
+                    raise  # part of the segment was already played
+                if not isinstance(e, asyncio.TimeoutError):
+                    self._demote(f"failed ({e})")
+        async for item in self.fallback.stream(text):
+            yield item
+
+
+def _load_piper_voice():
+    from piper.voice import PiperVoice
+
+    return PiperVoice.load(config.PIPER_VOICE_MODEL)
+
+
+def create_tts_engine(name=None):
+    name = name or config.TTS_ENGINE
+    if name == "edge":
+        return EdgeTTSEngine()
+    if name == "piper":
+        return PiperTTSEngine()
+    if name == "auto":
+        if importlib.util.find_spec("piper") is None:
+            logger.warning("piper-tts is not installed (requirements-offline.txt); TTS has no offline fallback")
+            return EdgeTTSEngine()
+        if not os.path.exists(config.PIPER_VOICE_MODEL):
+            logger.warning(f"No Piper voice at {config.PIPER_VOICE_MODEL}; TTS has no offline fallback")
+            return EdgeTTSEngine()
+        return AutoTTSEngine(EdgeTTSEngine(), PiperTTSEngine())
+    raise ValueError(f"Unknown TTS engine: {name}")
+
+
+registry.register("piper_voice", _load_piper_voice)
+registry.register("tts_engine", create_tts_engine)
@@ -0,0 +1,147 @@
+# tts_scheduler.py
+"""Sentence segmentation and look-ahead synthesis scheduling for TTS."""
+
+import queue
+import re
+import threading
+from src.utils.metrics import metrics
+from src.config import config
+
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+|\n+")
+_CLAUSE_BREAK = re.compile(r"(?<=[,;:])\s+")
+
+
+def split_sentences(text, min_chars=None, max_chars=None):
+    """Split `text` into speakable segments.
+
+    Sentences longer than `max_chars` are split again at clause punctuation,
+    and pieces shorter than `min_chars` are merged into the next one so
+    single words do not each cost a synthesis request.
+    """
+    min_chars = config.TTS_MIN_SEGMENT_CHARS if min_chars is None else min_chars
+    max_chars = config.TTS_MAX_SEGMENT_CHARS if max_chars is None else max_chars
+
+    pieces = []
+    for sentence in _SENTENCE_BREAK.split(text.strip()):
+        if len(sentence) > max_chars:
+            pieces.extend(_CLAUSE_BREAK.split(sentence))
+        else:
+            pieces.append(sentence)
+
+    segments = []
+    for piece in pieces:
+        piece = piece.strip()
+        if not piece:
+            continue
+        if segments and len(segments[-1]) < min_chars:
+            segments[-1] += " " + piece
+        else:
+            segments.append(piece)
+    return segments
+
+
+class SynthesisScheduler:
+    """Synthesises segment N+1..N+lookahead while segment N is playing.
+
+    `synthesize(text, pcm_queue, abandoned)` must start synthesis of one
+    segment in the background and return at once; it pushes PCM chunks to
+    `pcm_queue` followed by `None`. Segments are given up front or pushed
+    with `add` as they become available (then `close` marks the end).
+    Iterating yields the per-segment queues in playback order, waiting for
+    segments that have not arrived yet; `cancel` stops the iteration and
+    tells every running synthesis to stop.
+    """
+
+    def __init__(self, synthesize, segments=None, lookahead=None):
+        self.synthesize = synthesize
+        self.lookahead = config.TTS_LOOKAHEAD if lookahead is None else lookahead
+        self.abandoned = threading.Event()
+        self.cond = threading.Condition()
+        self.segments = []
+        self.queues = []
+        self.playing = 0  # index of the segment being played
+        self.closed = False
+        if segments is not None:
+            for segment in segments:
+                self.add(segment)
+            self.close()
+
+    def _fill(self):
+        last = self.playing + self.lookahead
+        while len(self.queues) < len(self.segments) and len(self.queues) <= last:
+            if self.abandoned.is_set():
+                return
+            pcm_queue = queue.Queue()
+            self.synthesize(self.segments[len(self.queues)], pcm_queue, self.abandoned)
+            self.queues.append(pcm_queue)
+
+    def add(self, segment):
+        with self.cond:
+            self.segments.append(segment)
+            self._fill()
+            self.cond.notify_all()
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+        metrics.observe("tts.segments", len(self.segments))
+
+    def __iter__(self):
+        index = 0
+        while True:
+            with self.cond:
+                self.playing = index
+                self._fill()
+                self.cond.wait_for(
+                    lambda: index < len(self.queues) or self.closed or self.abandoned.is_set()
+                )
+                if self.abandoned.is_set() or index >= len(self.queues):
+                    return
+                pcm_queue = self.queues[index]
+            yield pcm_queue
+            index += 1
+
+    def cancel(self):
+        with self.cond:
+            self.abandoned.set()
+            self.cond.notify_all()
+
+
+class SpeechStream:
+    """Text arriving in pieces (e.g. LLM tokens), spoken sentence by sentence.
+
+    `feed` buffers the text and hands every completed sentence to the
+    scheduler straight away, so speech starts while the rest is still being
+    generated; `close` flushes the remainder. A trailing piece shorter than
+    `TTS_MIN_SEGMENT_CHARS` is held back to be merged with what follows.
+    """
+
+    def __init__(self, scheduler, started=None):
+        self.scheduler = scheduler
+        self.started = started  # when the turn began, for time-to-first-audio
+        self.buffer = ""
+        self.text = ""
+
+    def feed(self, delta):
+        self.buffer += delta
+        self.text += delta
+        breaks = list(_SENTENCE_BREAK.finditer(self.buffer))
+        if not breaks:
+            return
+        complete, rest = self.buffer[: breaks[-1].start()], self.buffer[breaks[-1].end() :]
+        segments = split_sentences(complete)
+        if segments and len(segments[-1]) < config.TTS_MIN_SEGMENT_CHARS:
+            rest = segments.pop() + " " + rest
+        self.buffer = rest
+        for segment in segments:
+            self.scheduler.add(segment)
+
+    def close(self):
+        for segment in split_sentences(self.buffer):
+            self.scheduler.add(segment)
+        self.buffer = ""
+        self.scheduler.close()
+
+    def cancel(self):
+        self.scheduler.cancel()
@@ -1,6 +1,13 @@
-import asyncio, edge_tts, os, pyaudio, threading, queue, tempfile
+import threading, queue, time
+from src.audio import tts_engines  # registers the configured TTS engine
+from src.audio.playback import PlaybackEngine
+from src.audio.tts_cache import TTSCache
+from src.audio.tts_scheduler import SpeechStream, SynthesisScheduler, split_sentences
+from src.utils.async_runtime import AsyncLoopThread
+from src.utils.model_registry import registry
 from src.utils.logger import get_logger
-from pydub import AudioSegment
+from src.utils.metrics import metrics
+from src.utils.scheduler import BACKGROUND, TURN, scheduler as work_scheduler
 from src.config import config
 
 logger = get_logger()
@@ -11,102 +18,223 @@ class TTSPlayer(threading.Thread):
         super().__init__(daemon=True)
         self.tts_queue = queue.Queue()
         self.stop_event = threading.Event()
-        self.current_playback_event = threading.Event()
         self.lock = threading.Lock()
+        self.scheduler = None  # synthesis for the utterance being played
+        # Long-lived runtime: a warm playback engine per format, and one
+        # event loop for every synthesis request
+        self.engines = {}
+        self.loop = AsyncLoopThread("tts-loop")
+        self.loop.start()
+        self.engine = registry.get("tts_engine")
+        work_scheduler.submit(BACKGROUND, self.engine.warm_up)
+        # Repeated phrases are played from decoded PCM without a network call
+        self.cache = TTSCache()
+        self.warm_up(config.TTS_WARMUP_PHRASES)
 
     def run(self):
         while not self.stop_event.is_set():
             try:
-                text = self.tts_queue.get(timeout=0.1)
-                if text:  # Make sure we have text to speak
-                    self._speak(text)
+                item, token, on_done = self.tts_queue.get(timeout=0.1)
+                # Speech for a superseded turn is dropped without synthesising it
+                if item and not (token and token.cancelled):
+                    self._speak(item, token, on_done)
+                elif isinstance(item, SpeechStream):
+                    item.cancel()
                 self.tts_queue.task_done()
             except queue.Empty:
                 continue
             except Exception as e:
                 logger.error(f"Error in TTS thread: {e}")
 
-    async def synthesize_to_file(self, text: str, filename: str):
-        try:
-            communicate = edge_tts.Communicate(
-                text=text, voice=config.TTS_VOICE, rate=config.TTS_RATE
-            )
-            with open(filename, "wb") as f:
-                async for chunk in communicate.stream():
-                    if chunk["type"] == "audio":
-                        f.write(chunk["data"])
-        except Exception as e:
-            logger.error(f"Edge TTS error: {e}")
-            raise
-
     def stop_current(self):
+        """Silence current speech; returns without waiting for the device."""
         logger.debug("Stopping current speech playback")
-        self.current_playback_event.set()
-        # Small delay to ensure playback stops before new speech begins
-        threading.Event().wait(0.1)
-        self.current_playback_event.clear()
-
-    def _play_audio_segment(self, audio_segment):
-        p = None
-        stream = None
+        if self.scheduler:
+            self.scheduler.cancel()
+        for engine in list(self.engines.values()):
+            engine.stop()
+
+    def _interrupted(self, engine, epoch, token=None):
+        if self.stop_event.is_set() or engine.epoch != epoch:
+            return True
+        return bool(token and token.cancelled)
+
+    async def _synthesize(self, text, pcm_queue, abandoned):
+        """Stream `text` from the cache or the TTS engine, pushing PCM to `pcm_queue`.
+
+        `None` marks the end of the stream. Stops early once `abandoned` is
+        set (playback was interrupted).
+        """
+        chunks = []
+        voice = None
+        try:
+            # Looked up here, on the TTS loop, since callers may be on the agent loop
+            pcm = self.cache.get(text, self.engine.voice)
+            if pcm is not None:
+                pcm_queue.put(pcm)
+                return
+            async for voice, pcm in self.engine.stream(text):
+                if abandoned.is_set():
+                    return
+                chunks.append(pcm)
+                pcm_queue.put(pcm)
+            # Only complete utterances are cached
+            self.cache.put(text, b"".join(chunks), voice)
+        except Exception as e:
+            logger.error(f"TTS error ({self.engine.name}): {e}")
+        finally:
+            pcm_queue.put(None)
+
+    def _start_synthesis(self, text, pcm_queue, abandoned):
+        # Only schedules: streamed responses call this from the agent's event loop
+        self.loop.submit(self._synthesize(text, pcm_queue, abandoned))
+
+    def warm_up(self, phrases):
+        """Synthesise `phrases` into the cache as background work, skipping cached ones."""
+        segments = [segment for phrase in phrases for segment in split_sentences(phrase)]
+
+        def synthesize_missing():
+            for segment in segments:
+                if not self.cache.has(segment, self.engine.voice):
+                    self.loop.submit(self._synthesize(segment, queue.Queue(), threading.Event())).result()
+
+        work_scheduler.submit(BACKGROUND, synthesize_missing)
+
+    def _engine(self, rate, channels):
+        """The warm playback engine for this format, opened on first use."""
+        engine = self.engines.get((rate, channels))
+        if engine is None:
+            opened = time.perf_counter()
+            engine = PlaybackEngine(rate, channels)
+            self.engines[(rate, channels)] = engine
+            metrics.observe("tts.stream_open", time.perf_counter() - opened)
+        return engine
+
+    def _play_stream(self, pcm_queues, token=None, started=None, turn_started=None):
+        """Play each queue's PCM chunks as they arrive, back to back on one stream.
+
+        A queue ends with `None`; playback stops early on interruption.
+        `turn_started` (if known) is when the user's turn began, for the
+        per-turn time to first audio.
+        """
+        engine = None
+        first_audio = None
+        stalled = 0.0  # time spent waiting on synthesis once audio had started
         try:
-            p = pyaudio.PyAudio()
-            stream = p.open(
-                format=p.get_format_from_width(audio_segment.sample_width),
-                channels=audio_segment.channels,
-                rate=audio_segment.frame_rate,
-                output=True,
-            )
-
-            chunk_size = config.TTS_CHUNK_SIZE
-            audio_data = audio_segment.raw_data
-
-            for i in range(0, len(audio_data), chunk_size):
-                if self.stop_event.is_set() or self.current_playback_event.is_set():
+            engine = self._engine(config.TTS_SAMPLE_RATE, 1)
+            epoch = engine.epoch
+            if token:
+                # Silence on cancel straight away, not at the next write
+                token.on_cancel(lambda: engine.stop(epoch))
+            if started is not None:
+                metrics.observe("tts.setup", time.perf_counter() - started)
+
+            for pcm_queue in pcm_queues:
+                while not self._interrupted(engine, epoch, token):
+                    waited = time.perf_counter()
+                    try:
+                        pcm = pcm_queue.get(timeout=0.05)
+                    except queue.Empty:
+                        pcm = b""
+                    if first_audio is not None:
+                        stalled += time.perf_counter() - waited
+                    if pcm is None:
+                        break
+                    if not engine.write(pcm, epoch):
+                        break
+                    if pcm and first_audio is None:
+                        first_audio = time.perf_counter()
+                if self._interrupted(engine, epoch, token):
                     break
-                stream.write(audio_data[i : i + chunk_size])
         except Exception as e:
             logger.error(f"Audio playback error: {e}")
         finally:
-            if stream:
-                stream.stop_stream()
-                stream.close()
-            if p:
-                p.terminate()
-
-    def _speak(self, text):
-        if not text or not text.strip():
-            logger.warning("Empty text passed to speech engine")
-            return
-
-        logger.debug(f"🔈 Speaking: {text}")
+            if first_audio is not None and started is not None:
+                ttfa = first_audio - started
+                metrics.observe("tts.time_to_first_audio", ttfa)
+                metrics.observe("tts.playback_stall", stalled)
+                logger.debug(f"Time to first audio: {ttfa * 1000:.0f}ms, stalled {stalled * 1000:.0f}ms")
+            if first_audio is not None and turn_started is not None:
+                turn_ttfa = first_audio - turn_started
+                metrics.observe("turn.time_to_first_audio", turn_ttfa)
+                logger.info(f"⏱️ Turn time to first audio: {turn_ttfa * 1000:.0f}ms")
+            if engine and token and token.cancelled:
+                silenced = engine.wait_silent(timeout=0.5)
+                if silenced is not None:
+                    latency = max(0.0, silenced - token.cancelled_at)
+                    metrics.observe("tts.cancel_to_silence", latency)
+                    logger.debug(f"Cancelled speech silenced {latency * 1000:.0f}ms after cancel")
+
+    def _speak(self, item, token=None, on_done=None):
+        if isinstance(item, SpeechStream):
+            logger.debug("🔈 Speaking streamed response")
+            scheduler = item.scheduler
+            turn_started = item.started
+        else:
+            if not item.strip():
+                logger.warning("Empty text passed to speech engine")
+                return
+            logger.debug(f"🔈 Speaking: {item}")
+            # Later sentences are synthesised on the event loop while earlier ones play
+            scheduler = SynthesisScheduler(self._start_synthesis, split_sentences(item))
+            turn_started = None
+
+        self.scheduler = scheduler
+        if token:
+            token.on_cancel(scheduler.cancel)
+        started = time.perf_counter()
         try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as tmpfile:
-                filename = tmpfile.name
-                asyncio.run(self.synthesize_to_file(text, filename))
-
-            audio = AudioSegment.from_file(filename)
-            os.remove(filename)
-            self._play_audio_segment(audio)
-
+            # A turn's speech counts as turn work, so background jobs wait for it
+            with work_scheduler.running(TURN):
+                self._play_stream(scheduler, token, started, turn_started)
         except Exception as e:
             logger.error(f"Speech error: {e}")
-
-    def speak(self, text):
-        if not text:
-            return
-
-        self.stop_current()  # Interrupt current playback
-
-        # Clear queue and add new text
+        finally:
+            scheduler.cancel()
+            logger.debug(f"TTS cache: {self.cache.stats()}")
+        interrupted = self.stop_event.is_set() or (token and token.cancelled)
+        # Nothing queued behind it: the assistant is idle until the next wake word
+        if on_done and not interrupted and self.tts_queue.empty():
+            on_done()
+
+    def _replace_queued(self, item, token, on_done=None):
+        """Interrupt current speech and make `item` the only queued utterance."""
+        self.stop_current()
         with self.lock:
             while not self.tts_queue.empty():
                 try:
-                    self.tts_queue.get_nowait()
+                    dropped, _, _ = self.tts_queue.get_nowait()
+                    if isinstance(dropped, SpeechStream):
+                        dropped.cancel()
                     self.tts_queue.task_done()
                 except queue.Empty:
                     break
-            self.tts_queue.put(text)
+            self.tts_queue.put((item, token, on_done))
+
+    def speak(self, text, token=None, on_done=None):
+        """Queue `text`, interrupting current speech.
+
+        If `token` is given the speech belongs to that turn: it is dropped
+        while queued, and playback stops, once the token is cancelled.
+        `on_done` runs on the player thread once the speech has played out
+        uninterrupted with nothing else queued.
+        """
+        if not text:
+            return
+        self._replace_queued(text, token, on_done)
+
+    def open_stream(self, token=None, started=None, on_done=None):
+        """Start speaking text that is still being generated.
+
+        Interrupts current speech like `speak`. Feed the returned
+        SpeechStream as text arrives and close it at the end; synthesis of
+        each sentence starts as soon as it is complete. `started` is when the
+        turn began, for the per-turn time to first audio; `on_done` is as
+        for `speak`.
+        """
+        stream = SpeechStream(SynthesisScheduler(self._start_synthesis), started)
+        self._replace_queued(stream, token, on_done)
+        return stream
 
     def shutdown(self):
         logger.info("Shutting down TTS Player")
@@ -117,3 +245,9 @@ class TTSPlayer(threading.Thread):
             self.tts_queue.join(timeout=1.0)
         except:
             pass  # If we time out, just continue with shutdown
+        if self.is_alive():
+            self.join(timeout=1.0)  # let an interrupted write return before closing
+        self.loop.stop()
+        for engine in self.engines.values():
+            engine.close()
+        self.engines.clear()
@@ -1,28 +1,21 @@
-import numpy as np
-import torch
-import pvporcupine
-import struct
 import sounddevice as sd
-import time
-import soundfile as sf
-import os
-from resemblyzer import VoiceEncoder, preprocess_wav
 
-torch.set_num_threads(1)
-import collections, os, threading
+import os, threading
+from src.audio import models  # registers the shared audio models
+from src.audio.endpointing import Endpointer
+from src.audio.frame_pipeline import PorcupineFrameAdapter
+from src.audio.speaker_verifier import RollingSpeakerVerifier
+from src.audio.voiceprint import VoicePrintStore
+from src.utils.model_registry import registry
 from src.utils.logger import get_logger
-from src.utils.thread_executor import executor
+from src.utils.metrics import metrics
 from src.config import config
 
-model, utils = torch.hub.load(repo_or_dir="snakers4/silero-vad", model="silero_vad")
-
-(get_speech_timestamps, save_audio, read_audio, VADIterator, collect_chunks) = utils
-
 logger = get_logger()
 
 
 class VoiceActivityDetector:
-    def __init__(self, tts_player=None, overlay=None):
+    def __init__(self, tts_player=None, overlay=None, stt_stream=None, on_wake=None):
         # Audio config
         self.SAMPLE_RATE = config.SAMPLE_RATE
         self.CHANNELS = config.CHANNELS
@@ -33,44 +26,36 @@ class VoiceActivityDetector:
         self.lock = threading.Lock()
         self.tts_player = tts_player
         self.overlay = overlay
+        self.stt_stream = stt_stream  # Transcribes finished segments while recording
+        self.on_wake = on_wake  # Barge-in hook, e.g. cancelling in-flight turns
 
-        # Load sound effects
-        self.start_sound, self.start_sr = sf.read(config.START_SOUND_FILE)
-        self.stop_sound, self.stop_sr = sf.read(config.STOP_SOUND_FILE)
-
-        # Initialize Porcupine
-        self.porcupine = pvporcupine.create(
-            access_key=config.PORCUPINE_ACCESS_KEY,
-            keyword_paths=[config.WAKE_WORD_MODEL],
-            sensitivities=[0.95]
-        )
+        # Shared models and devices; loaded once per process by the registry
+        self.porcupine = registry.get("porcupine")
+        self.wake_word = PorcupineFrameAdapter(self.porcupine)
 
-        # Initialize audio stream
-        self.stream = sd.InputStream(
-            channels=self.CHANNELS,
-            samplerate=self.SAMPLE_RATE,
-            dtype='int16',
-            blocksize=self.num_samples
-        )
-        self.stream.start()
+        # Callback-driven capture; each consumer reads through its own cursor
+        self.capture = registry.get("capture")
+        self.wake_reader = self.capture.reader("wakeword")
+        self.vad_reader = self.capture.reader("vad")
+        self.pre_roll_frames = config.PRE_ROLL_FRAMES
 
-        # Initialize audio output stream
-        self.output_stream = sd.OutputStream(
-            samplerate=44100,
-            channels=1,
-            dtype='float32'
-        )
-        self.output_stream.start()
+        # Start/stop cues, pre-decoded and mixed on the output stream's own thread
+        self.cues = registry.get("cue_player")
 
         self.confidence_threshold = config.CONFIDENCE_THRESHOLD
+        self.vad = registry.get("vad")
+        self.endpointer = Endpointer(self.num_samples, self.SAMPLE_RATE, self.confidence_threshold)
 
-        self.voice_encoder = VoiceEncoder()
+        self.voice_encoder = registry.get("voice_encoder")
         self.OWNER_VOICE_FILE = config.OWNER_VOICE_FILE
-        self.owner_embeddings = None
+        self.voiceprints = VoicePrintStore()
 
+        # Only recordings whose hash is not in the store are embedded
         if os.path.exists(self.OWNER_VOICE_FILE):
-            self.owner_embeddings = self.voice_encoder.embed_utterance(preprocess_wav(self.OWNER_VOICE_FILE))
-            logger.info("✅ Owner voice file found. Loading embeddings...")
+            self.voiceprints.enroll("owner", self.OWNER_VOICE_FILE, self.voice_encoder)
+
+        if len(self.voiceprints):
+            logger.info(f"✅ Loaded {len(self.voiceprints)} enrolled voice samples")
         else:
             logger.error(
                 "Owner voice file not found. Please record your voice and save it in data/owner.wav\n"
@@ -78,44 +63,84 @@ class VoiceActivityDetector:
             )
             exit(1)
 
-    def int2float(self, sound):
-        abs_max = np.abs(sound).max()
-        sound = sound.astype("float32")
-        if abs_max > 0:
-            sound *= 1 / 32768
-        return sound.squeeze()
+        # Keeps a speaker verdict ready before the wake word fires
+        self.speaker_verifier = RollingSpeakerVerifier(self.capture, self.voice_encoder, self.voiceprints)
+        self.speaker_verifier.start()
+
+        logger.debug(f"Model registry: {registry.stats()}")
 
-    def record_audio(self, frames=[]):
+    def record_audio(self, start_position):
         with self.lock:
             if self.overlay:
                 self.overlay.put_message("status", "Listening...", "skyblue")
             self.recording = True
             logger.debug("Recording started...")
-            # Play start sound effect
-            self.play_sound(self.start_sound, self.start_sr)
+            # Play start sound effect; returns at once, capture is never delayed
+            self.cues.play("start")
 
             silence_frames = 0
-            max_silence_frames = config.MAX_SILENCE_FRAMES
             max_recording_frames = config.MAX_RECORDING_FRAMES
-
-            while silence_frames < max_silence_frames and len(frames) < max_recording_frames:
-                audio_chunk, _ = self.stream.read(self.num_samples)
-                audio_float32 = self.int2float(audio_chunk)
-                frames.append(audio_chunk)
-
-                confidence = model(torch.from_numpy(audio_float32), self.SAMPLE_RATE).item()
-
-                if confidence > self.confidence_threshold:
-                    silence_frames = 0
-                else:
-                    silence_frames += 1
-
-            # Convert frames to numpy array
-            audio_data = np.concatenate(frames[:-60])
+            pre_roll = min(self.pre_roll_frames, start_position)
+            recorded_frames = pre_roll
+            utterance_complete = False
+
+            # Segments closed at pauses are transcribed while recording continues
+            session = self.stt_stream.begin() if self.stt_stream else None
+            # A segment cut must always come before the endpoint closes the recording
+            pause_frames = min(config.STT_SEGMENT_PAUSE_FRAMES, self.endpointer.early_frames - 1)
+            min_segment_frames = config.STT_MIN_SEGMENT_FRAMES
+            segment_start = start_position - pre_roll
+            segment_has_speech = False
+
+            self.vad.reset()
+            self.endpointer.reset()
+            self.vad_reader.seek(start_position)
+            while not utterance_complete and recorded_frames < max_recording_frames:
+                if not self.capture.wait_for(self.vad_reader.position + 1, timeout=1.0):
+                    break
+                # Score everything queued since the last pass in one call
+                pending = min(self.vad_reader.available(), max_recording_frames - recorded_frames)
+                frames = [self.vad_reader.read() for _ in range(pending)]
+                confidences = self.vad.speech_probs(frames)
+
+                for frame, confidence in zip(frames, confidences):
+                    recorded_frames += 1
+                    utterance_complete = self.endpointer.update(
+                        confidence, self.endpointer.frame_energy(frame)
+                    )
+                    silence_frames = self.endpointer.silence_frames
+                    if confidence > self.confidence_threshold:
+                        segment_has_speech = True
+
+                    if session and segment_has_speech and silence_frames == pause_frames:
+                        # Cut in the middle of the pause so no word is split
+                        cut = start_position + recorded_frames - pre_roll - silence_frames // 2
+                        if cut - segment_start >= min_segment_frames:
+                            session.add_segment(self.capture.frames_before(cut, cut - segment_start))
+                            segment_start = cut
+                            segment_has_speech = False
+                    if utterance_complete:
+                        break
+
+            metrics.observe("endpoint.silence_ms", silence_frames * self.endpointer.frame_ms)
+            logger.debug(f"Endpoint after {silence_frames * self.endpointer.frame_ms:.0f}ms of silence")
+
+            # Slice the recording straight out of the ring, keeping a short tail of the pause
+            end_position = start_position + recorded_frames - pre_roll
+            trimmed = max(0, silence_frames - config.ENDPOINT_TAIL_PAD_FRAMES)
+            speech_end = end_position - trimmed
+            self.vad_reader.seek(end_position)
+            audio_data = self.capture.frames_before(speech_end, recorded_frames - trimmed)
+            if session:
+                last_segment = None
+                if segment_has_speech and speech_end > segment_start:
+                    last_segment = self.capture.frames_before(speech_end, speech_end - segment_start)
+                session.finish(last_segment, audio_data)
+                audio_data = session
             self.recording = False
             logger.debug("Recording stopped...")
             # Play stop sound effect
-            self.play_sound(self.stop_sound, self.stop_sr)
+            self.cues.play("stop")
 
             if self.overlay:
                 self.overlay.put_message("status", "Active", "green")
@@ -123,52 +148,46 @@ class VoiceActivityDetector:
 
     def listen(self, func):
         self.listening = True
-        frame_queue = collections.deque(maxlen=60)  # for audio_chunk frames (int16)
-        float_queue = collections.deque(maxlen=60)  # for speaker verification (float32)
 
         while self.listening:
-            if self.recording:
-                time.sleep(0.01)  # Add small delay to prevent busy waiting
+            audio_chunk = self.wake_reader.read(timeout=0.5)
+            if audio_chunk is None:
                 continue
 
-            audio_chunk, _ = self.stream.read(self.num_samples)
-            audio_float = self.int2float(audio_chunk)
-
-            # Add current frame to queue
-            frame_queue.append(audio_chunk)
-            float_queue.append(audio_float)
-
-            # Check for wake word if not already recording
-            pcm = struct.unpack_from("h" * self.porcupine.frame_length, audio_chunk.tobytes())
-            keyword_index = self.porcupine.process(pcm)
+            # Check for wake word; the float pre-roll is only derived on a hit
+            keyword_index = self.wake_word.process(audio_chunk)
             if keyword_index == -1:
                 continue
             logger.debug("🎯 Wake word detected!")
+            wake_position = self.wake_reader.position
 
             # === Speaker verification before continuing ===
-            if self.owner_embeddings is not None:
-                float_buffer = np.concatenate(list(float_queue))  # ~1s of audio
-                predicted_embedding = self.voice_encoder.embed_utterance(float_buffer)
-                similarity = np.dot(self.owner_embeddings, predicted_embedding)
+            if len(self.voiceprints):
+                speaker, similarity = self.speaker_verifier.verify(wake_position)
 
-                logger.debug(f"🔍 Speaker similarity: {similarity:.3f}")
+                logger.debug(f"🔍 Speaker similarity: {similarity:.3f} ({speaker})")
                 if similarity < config.SPEAKER_SIMILARITY_THRESHOLD:
                     logger.warning("🚫 Voice does not match owner. Ignoring wake word.")
                     continue  # Skip further processing
 
-                logger.info("✅ Speaker verified as owner")
+                logger.info(f"✅ Speaker verified as {speaker}")
+
+            if self.on_wake:
+                self.on_wake()
 
             # Stop TTS playback if available
             if self.tts_player:
                 self.tts_player.stop_current()
                 logger.debug("Stopped TTS playback due to wake word detection")
 
-            audio_data = self.record_audio(list(frame_queue))
+            audio_data = self.record_audio(wake_position)
+            # The recorded command is not wake-word material; resume after it
+            self.wake_reader.seek(self.vad_reader.position)
+            logger.debug(f"Capture stats: {self.capture.stats()}")
 
-            # Process in a separate thread to avoid blocking the main loop
-            future = executor.submit(func, audio_data)
+            # Hand off and go straight back to wake word detection; `func` must not block
             try:
-                future.result(timeout=config.AUDIO_PROCESSING_TIMEOUT)
+                func(audio_data)
             except Exception as e:
                 logger.error(f"Error processing audio: {e}")
 
@@ -176,23 +195,9 @@ class VoiceActivityDetector:
 
     def stop_listening(self):
         self.listening = False
-        if hasattr(self, 'porcupine'):
-            self.porcupine.delete()
-        if hasattr(self, 'stream'):
-            self.stream.stop()
-            self.stream.close()
-        if hasattr(self, 'output_stream'):
-            self.output_stream.stop()
-            self.output_stream.close()
-
-    def play_sound(self, sound_data, sample_rate):
-        # Stop any currently playing sound
-        self.output_stream.stop()
-        self.output_stream.start()
-        # Convert sound data to float32 before playing
-        sound_data = sound_data.astype('float32')
-        # Play the new sound
-        self.output_stream.write(sound_data)
+        self.speaker_verifier.stop()
+        for name in ("porcupine", "capture", "cue_player"):
+            registry.unload(name)
 
     def play_audio(self, audio_data):
         duration_seconds = len(audio_data) / self.SAMPLE_RATE
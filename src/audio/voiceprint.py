@@ -0,0 +1,125 @@
+# voiceprint.py
+"""Persisted speaker enrollment embeddings with vectorised matching."""
+
+import hashlib
+import os
+import numpy as np
+from src.utils.logger import get_logger
+from src.config import config
+
+logger = get_logger()
+
+
+def file_hash(path):
+    """SHA-256 of a file's contents, used to skip re-embedding known samples."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class VoicePrintStore:
+    """Enrollment samples for one or more speakers, held as one matrix.
+
+    Every row of `embeddings` is an L2-normalised utterance embedding, with
+    the owning speaker, the path of its source recording and that file's
+    hash kept alongside. The store is saved as a single `.npz` file, so
+    startup only has to hash the enrollment recordings instead of embedding
+    them again. Re-enrolling a path whose contents changed replaces its row.
+    """
+
+    def __init__(self, path=None, dim=256):
+        self.path = path or config.VOICEPRINT_STORE
+        self.dim = dim
+        self.embeddings = np.zeros((0, dim), dtype=np.float32)
+        self.speakers = []
+        self.sources = []
+        self.hashes = []
+        self.load()
+
+    def __len__(self):
+        return len(self.speakers)
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        with np.load(self.path) as data:
+            if "sources" not in data:
+                # Rows without a source could outlive a replaced recording
+                logger.warning(
+                    f"⚠️ Discarding voice prints in {self.path} saved without their source files; "
+                    "samples are embedded again (re-run setup/record_owner_voice.py for extra ones)"
+                )
+                return
+            self.embeddings = data["embeddings"].astype(np.float32)
+            self.speakers = data["speakers"].tolist()
+            self.sources = data["sources"].tolist()
+            self.hashes = data["hashes"].tolist()
+        logger.debug(f"Loaded {len(self)} voice prints for {sorted(set(self.speakers))}")
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp.npz"
+        np.savez(
+            tmp_path,
+            embeddings=self.embeddings,
+            speakers=np.array(self.speakers, dtype=str),
+            sources=np.array(self.sources, dtype=str),
+            hashes=np.array(self.hashes, dtype=str),
+        )
+        os.replace(tmp_path, self.path)
+
+    def add(self, speaker, embedding, source, sample_hash):
+        """Append one normalised embedding for `speaker`, recorded in `source`."""
+        embedding = np.asarray(embedding, dtype=np.float32)
+        embedding = embedding / max(np.linalg.norm(embedding), 1e-9)
+        self.embeddings = np.vstack([self.embeddings, embedding[None, :]])
+        self.speakers.append(speaker)
+        self.sources.append(source)
+        self.hashes.append(sample_hash)
+
+    def remove_source(self, source):
+        """Drop every row embedded from `source`; returns how many were removed."""
+        keep = [i for i, s in enumerate(self.sources) if s != source]
+        removed = len(self.sources) - len(keep)
+        if removed:
+            self.embeddings = self.embeddings[keep].reshape(-1, self.embeddings.shape[1])
+            self.speakers = [self.speakers[i] for i in keep]
+            self.sources = [self.sources[i] for i in keep]
+            self.hashes = [self.hashes[i] for i in keep]
+        return removed
+
+    def enroll(self, speaker, wav_path, voice_encoder):
+        """Embed `wav_path` for `speaker` unless that exact recording is already stored.
+
+        If the file was enrolled before with different contents (e.g. the
+        owner re-recorded data/owner.wav), the old embedding is replaced.
+        Returns True if a new embedding was computed and saved.
+        """
+        source = os.path.abspath(wav_path)
+        sample_hash = file_hash(wav_path)
+        if any(s == source and h == sample_hash for s, h in zip(self.sources, self.hashes)):
+            return False
+
+        from resemblyzer import preprocess_wav
+
+        logger.info(f"Embedding new voice sample for '{speaker}': {wav_path}")
+        embedding = voice_encoder.embed_utterance(preprocess_wav(wav_path))
+        if self.remove_source(source):
+            logger.info(f"Replaced the previous voice print of {wav_path}")
+        self.add(speaker, embedding, source, sample_hash)
+        self.save()
+        return True
+
+    def match(self, embedding):
+        """Return `(speaker, similarity)` of the closest enrollment sample.
+
+        One matrix-vector product scores every sample of every speaker.
+        """
+        if not len(self):
+            return None, 0.0
+        embedding = np.asarray(embedding, dtype=np.float32)
+        scores = self.embeddings @ (embedding / max(np.linalg.norm(embedding), 1e-9))
+        best = int(np.argmax(scores))
+        return self.speakers[best], float(scores[best])
@@ -21,6 +21,8 @@ class Config:
     LLM_PROVIDER = "groq"
     LLM_TEMPERATURE = 0.8
     LLM_API_KEY = GROQ_API_KEY
+    SUMMARY_LLM_MODEL = "llama-3.1-8b-instant"  # Cheap model for background history compaction
+    SUMMARY_LLM_PROVIDER = "groq"
 
     # Logging
     LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")
@@ -30,28 +32,66 @@ class Config:
     CHANNELS = 1
     CHUNK_SIZE = SAMPLE_RATE // 10
     NUM_SAMPLES = 512
+    CAPTURE_BUFFER_SECONDS = 30  # Ring buffer shared by wake word, VAD and speaker checks
+    PRE_ROLL_FRAMES = 60  # ~2 seconds kept before the wake word
 
     # Voice Activity Detection
     CONFIDENCE_THRESHOLD = 0.5
-    MAX_SILENCE_FRAMES = 60  # ~2 seconds of silence
+    VAD_BACKEND = os.environ.get("VAD_BACKEND", "onnx")  # "onnx" or "torch"
+    VAD_ONNX_MODEL = "models/silero_vad.onnx"
+    MAX_SILENCE_FRAMES = 60  # ~2 seconds of silence before giving up when nothing is said
+    ENDPOINT_EARLY_SILENCE_MS = 300  # Close this soon when a short command's pause is clearly final
+    ENDPOINT_SHORT_UTTERANCE_MS = 1500  # Longer utterances always wait for the full hangover
+    ENDPOINT_MIN_SILENCE_MS = 600  # Hangover for short commands
+    ENDPOINT_MAX_SILENCE_MS = 1000  # Hangover once ENDPOINT_LONG_UTTERANCE_MS of speech is heard
+    ENDPOINT_LONG_UTTERANCE_MS = 5000
+    ENDPOINT_TAIL_PAD_FRAMES = 5  # ~160 ms of the final pause kept in the recording
     MAX_RECORDING_FRAMES = 20 * SAMPLE_RATE // NUM_SAMPLES  # 20 seconds max
     SPEAKER_SIMILARITY_THRESHOLD = 0.6
+    SPEAKER_PARTIAL_FRAMES = 32  # ~1 second per rolling partial embedding
+    SPEAKER_HOP_FRAMES = 8  # New partial every ~0.25 seconds while voiced
+    SPEAKER_MAX_LAG_FRAMES = 8  # Oldest rolling verdict still usable on wake
+    SPEAKER_ENERGY_THRESHOLD = 0.01  # RMS below this is treated as silence
 
     # TTS Configuration
+    # "edge" (online), "piper" (offline, CPU) or "auto" (edge, falling back to piper)
+    TTS_ENGINE = os.environ.get("TTS_ENGINE", "auto")
+    TTS_NETWORK_BUDGET_MS = 800  # Edge first audio later than this switches auto to piper
+    TTS_ENGINE_RETRY_SECONDS = 60  # How long auto stays on piper before retrying edge
+    PIPER_VOICE_MODEL = "models/piper/en_US-lessac-medium.onnx"
+    PIPER_LENGTH_SCALE = 0.77  # < 1 speaks faster; ~TTS_RATE "+30%"
     TTS_VOICE = "en-US-RogerNeural"
     TTS_RATE = "+30%"
-    TTS_CHUNK_SIZE = 1024
+    PLAYBACK_BLOCK_SIZE = 256  # Frames per output callback (~11 ms at 24 kHz)
+    PLAYBACK_LATENCY = "low"  # Device buffer: "low", "high" or seconds
+    PLAYBACK_BUFFER_MS = 200  # Audio queued ahead of the device; dropped on stop
+    TTS_SAMPLE_RATE = 24000  # PCM rate streamed MP3 is decoded to (edge-tts native rate)
+    TTS_LOOKAHEAD = 1  # Sentences synthesised ahead of the one playing
+    STREAM_RESPONSES = True  # Speak and show the response while the agent is still generating it
+    TTS_MIN_SEGMENT_CHARS = 20  # Shorter sentences are merged with the next
+    TTS_MAX_SEGMENT_CHARS = 200  # Longer sentences are split at clause punctuation
+    TTS_CACHE_DIR = "cache/tts"  # Decoded PCM of synthesised phrases
+    TTS_CACHE_MEMORY_BYTES = 8 * 1024 * 1024  # ~3 minutes of 24 kHz speech
+    TTS_CACHE_DISK_BYTES = 64 * 1024 * 1024
+    TTS_WARMUP_PHRASES = [  # Pre-synthesised at startup
+        "Shutting down!",
+        "Sorry, an error occurred while processing your request.",
+    ]
 
     # File Paths
     OWNER_VOICE_FILE = "data/owner.wav"
+    VOICEPRINT_STORE = "data/voiceprints.npz"  # Cached enrollment embeddings
     WAKE_WORD_MODEL = "wakewordmodels/Jasper_en_linux_v3_0_0.ppn"
     SCREENSHOT_FILE = "screenshot.png"
-    TEMP_AUDIO_FILE = "temp.wav"
     CHECKPOINTS_DB = "checkpoints/sqlite.db"
+    SILERO_VAD_REPO = "models/silero-vad"  # Optional vendored checkout for the torch backend
+    TORCH_HUB_DIR = "models/torch_hub"
 
     # Sound Effects
     START_SOUND_FILE = "data/soundeffects/start_recording.mp3"
     STOP_SOUND_FILE = "data/soundeffects/stop_recording.mp3"
+    CUE_SAMPLE_RATE = 44100  # Cues are resampled to this rate once, at load time
+    CUE_BLOCK_SIZE = 256  # Output callback block (~6 ms at 44.1 kHz)
 
     # UI Configuration
     OVERLAY_WIDTH = 400
@@ -61,20 +101,39 @@ class Config:
     MESSAGE_TIMEOUT = 5
 
     # Thread Configuration
-    MAX_WORKERS = 3
-    AUDIO_PROCESSING_TIMEOUT = 10
+    TURN_QUEUE_SIZE = 4  # Bounded queue between each turn pipeline stage
+    SCHED_REALTIME_NICE = -10  # Capture thread; raising priority needs CAP_SYS_NICE
+    SCHED_TURN_NICE = 0
+    SCHED_BACKGROUND_NICE = 15
+    SCHED_TURN_WORKERS = 4
+    SCHED_TURN_QUEUE = 16  # Pending turn jobs before new ones are rejected
+    SCHED_BACKGROUND_WORKERS = 1
+    SCHED_BACKGROUND_QUEUE = 16
 
     # Agent Configuration
     THREAD_ID = "4"
-    MAX_TOKENS_HISTORY = 10000
+    AGENT_MAX_CONCURRENCY = 4  # Agent requests running at once on the agent loop; the rest wait
+    AGENT_TOOL_WORKERS = 4  # Threads for blocking tool calls
+    MAX_TOKENS_HISTORY = 10000  # History is compacted in the background beyond this
+    HISTORY_KEEP_TOKENS = 2000  # Recent messages kept verbatim when compacting
+    IMAGE_TOKENS = 1500  # Flat token estimate per image (e.g. a screenshot) in the history
 
     # Whisper Configuration
-    TRANSCRIPTION_MODEL = "distil-whisper-large-v3-en"
+    # "local/<size>" (e.g. "local/base.en") runs faster-whisper on the CPU (requirements-offline.txt); anything else uses Groq
+    TRANSCRIPTION_MODEL = os.environ.get("TRANSCRIPTION_MODEL", "distil-whisper-large-v3-en")
+    TRANSCRIPTION_CODEC = os.environ.get("TRANSCRIPTION_CODEC", "flac")  # "wav", "flac" or "opus"
     TRANSCRIPTION_PROMPT = (
         "Please transcribe the following audio accurately, maintaining proper "
         "punctuation and formatting. This is a conversation between a user and "
         "a Desktop Assistant named \"Jasper\". So, focus on words like 'Jasper'."
     )
+    STREAMING_TRANSCRIPTION = True  # Transcribe segments at pauses while still recording
+    STT_SEGMENT_PAUSE_FRAMES = 8  # ~256 ms pause closes a segment; kept below every endpoint
+    STT_MIN_SEGMENT_FRAMES = 47  # ~1.5 s minimum segment length
+    STT_MAX_PARALLEL_SEGMENTS = 2
+    LOCAL_WHISPER_COMPUTE_TYPE = "int8"
+    LOCAL_WHISPER_THREADS = 4
+    LOCAL_WHISPER_DIR = "models/whisper"
 
     # ADB Configuration
     ADB_HOST = os.environ.get("ADB_HOST", "127.0,0,1")
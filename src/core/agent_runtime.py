@@ -0,0 +1,155 @@
+# agent_runtime.py
+"""A dedicated asyncio loop for agent turns, with a bounded pool for blocking tools."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from langchain_core.messages import RemoveMessage
+from src.utils.async_runtime import AsyncLoopThread
+from src.utils.metrics import metrics
+from src.config import config
+
+
+async def discard_turn(graph, config_dict, before):
+    """Rewind the thread to `before`, the state snapshot taken when the turn began.
+
+    LangGraph still checkpoints the last completed step when a run is
+    abandoned, so a cancelled turn would leave its question, any tool calls
+    and partial results in the history for the next turn to answer. Every
+    message added since `before` is removed and the other state keys are
+    restored. Written as the tools node, so the graph stays valid even when
+    the thread is left empty. Returns how many messages were removed.
+    """
+    state = await graph.aget_state(config_dict)
+    previous = before.values
+    kept = {m.id for m in previous.get("messages", [])}
+    added = [m.id for m in state.values.get("messages", []) if m.id not in kept]
+    if not added:
+        return 0
+    update = {
+        key: value for key, value in previous.items()
+        if key != "messages" and state.values.get(key) != value
+    }
+    update["messages"] = [RemoveMessage(id=message_id) for message_id in added]
+    await graph.aupdate_state(config_dict, update, as_node="tools")
+    metrics.incr("agent.discarded_messages", len(added))
+    return len(added)
+
+
+class ToolPool(ThreadPoolExecutor):
+    """A fixed-size pool for blocking tool calls that reports its queue.
+
+    Installed as the agent loop's default executor, so synchronous tools
+    (and anything else the graph hands to `run_in_executor`) run here
+    without ever blocking the loop. `agent.tool.queued` is the number of
+    calls waiting for a worker and `agent.tool.wait` how long each waited.
+    """
+
+    def __init__(self, max_workers):
+        super().__init__(max_workers=max_workers, thread_name_prefix="agent-tool")
+        self.queue_lock = threading.Lock()
+        self.queued = 0
+
+    def _count(self, delta):
+        with self.queue_lock:
+            self.queued += delta
+            metrics.gauge("agent.tool.queued", self.queued)
+
+    def submit(self, fn, *args, **kwargs):
+        submitted = time.perf_counter()
+        self._count(1)
+
+        def timed():
+            self._count(-1)
+            metrics.observe("agent.tool.wait", time.perf_counter() - submitted)
+            return fn(*args, **kwargs)
+
+        return super().submit(timed)
+
+
+class AgentRuntime:
+    """Runs agent requests as coroutines on one event loop thread.
+
+    A request waiting on the LLM or on network I/O costs a coroutine, not a
+    thread, so any number of them can be in flight. At most
+    `max_concurrency` run at once; the rest wait for a slot, which is
+    reported as `agent.queued` / `agent.wait`. Blocking tools go to a
+    separate `ToolPool` of `tool_workers` threads.
+
+    `submit` returns a concurrent.futures.Future; `run` waits for it and,
+    with a token, cancels the coroutine as soon as the turn is superseded.
+    `submit_io` / `run_io` do the same for short I/O requests such as
+    speech-to-text, which run on the loop without taking an agent slot.
+    """
+
+    def __init__(self, max_concurrency=None, tool_workers=None):
+        self.tools = ToolPool(tool_workers or config.AGENT_TOOL_WORKERS)
+        self.thread = AsyncLoopThread("agent-loop")
+        self.thread.loop.set_default_executor(self.tools)
+        self.thread.start()
+        self.slots = asyncio.Semaphore(max_concurrency or config.AGENT_MAX_CONCURRENCY)
+        self.queued = 0
+        self.in_flight = 0
+
+    @property
+    def loop(self):
+        return self.thread.loop
+
+    async def _admit(self, coro):
+        submitted = time.perf_counter()
+        self.queued += 1
+        metrics.gauge("agent.queued", self.queued)
+        try:
+            await self.slots.acquire()
+        except asyncio.CancelledError:
+            coro.close()  # cancelled before it started
+            raise
+        finally:
+            self.queued -= 1
+            metrics.gauge("agent.queued", self.queued)
+
+        started = time.perf_counter()
+        metrics.observe("agent.wait", started - submitted)
+        self.in_flight += 1
+        metrics.gauge("agent.in_flight", self.in_flight)
+        try:
+            return await coro
+        except asyncio.CancelledError:
+            metrics.incr("agent.cancelled")
+            raise
+        finally:
+            self.slots.release()
+            self.in_flight -= 1
+            metrics.gauge("agent.in_flight", self.in_flight)
+            metrics.observe("agent.run", time.perf_counter() - started)
+
+    def submit(self, coro):
+        """Schedule `coro` behind the concurrency limit; thread-safe."""
+        return self.thread.submit(self._admit(coro))
+
+    def run(self, coro, token=None):
+        """Run `coro` and wait for its result from a worker thread.
+
+        With `token`, cancellation cancels the coroutine (and any LLM request
+        it is awaiting) and raises TurnCancelled.
+        """
+        return self._wait(self.submit(coro), token)
+
+    def submit_io(self, coro):
+        """Schedule `coro` on the loop straight away, outside the agent limit; thread-safe."""
+        return self.thread.submit(coro)
+
+    def run_io(self, coro, token=None):
+        """Like `run`, for a coroutine scheduled with `submit_io`."""
+        return self._wait(self.submit_io(coro), token)
+
+    def _wait(self, future, token):
+        if token is None:
+            return future.result()
+        token.on_cancel(future.cancel)
+        return token.result(future)
+
+    def shutdown(self):
+        self.thread.stop()
+        self.tools.shutdown(wait=False, cancel_futures=True)
@@ -1,24 +1,60 @@
 # assistant.py
+import asyncio
 import base64
-from .generate_prompt import prompt
+import time
+from contextlib import aclosing
+from .generate_prompt import SYSTEM_TOKENS, prompt
 from langgraph.prebuilt import create_react_agent
 from langgraph.prebuilt.chat_agent_executor import AgentState
-from langchain_core.messages import HumanMessage
-from src.core.llm import model
+from langchain_core.messages import AIMessageChunk, HumanMessage, RemoveMessage
+from langchain_core.runnables import RunnableLambda
+from src.core.llm import model, usage_metrics
+from src.utils.cancellation import TurnCancelled
 from src.utils.logger import get_logger
+from src.utils.metrics import metrics
+from src.utils.scheduler import BACKGROUND, scheduler
 from .tools import get_all_tools  # Import the function to get all tools
-from langgraph.checkpoint.sqlite import SqliteSaver
-import sqlite3
+from .summarizer import summarize_conversation
+from .token_ledger import context_tokens, count_cached, remove_from_ledger, text_tokens, update_ledger
+from .agent_runtime import AgentRuntime, discard_turn
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+import aiosqlite
 from src.config import config
 
 logger = get_logger()
 
-conn = sqlite3.connect(config.CHECKPOINTS_DB, check_same_thread=False)
-checkpointer = SqliteSaver(conn)
+# Agent turns run as coroutines on their own loop; the checkpointer is bound to it
+runtime = AgentRuntime()
+
+
+async def _open_checkpointer():
+    conn = await aiosqlite.connect(config.CHECKPOINTS_DB)
+    return AsyncSqliteSaver(conn)
+
+
+checkpointer = runtime.thread.submit(_open_checkpointer()).result()
 
 
 class State(AgentState):
     summary: str
+    token_ledger: dict  # see token_ledger.py
+
+
+def _track_tokens(state):
+    """Pre-model hook: count messages added since the last LLM call into the ledger."""
+    fresh = not (state.get("token_ledger") or {}).get("last")
+    ledger = update_ledger(state.get("token_ledger"), state["messages"])
+    if fresh:
+        ledger["summary"] = text_tokens(state.get("summary", ""))
+    ledger["system"] = SYSTEM_TOKENS
+    metrics.observe("agent.context_tokens", context_tokens(ledger))
+    # No new messages, only the ledger
+    return {"messages": [], "token_ledger": ledger}
+
+
+async def _atrack_tokens(state):
+    # Cheap enough to run on the loop instead of hopping to the tool pool
+    return _track_tokens(state)
 
 
 logger.info("Chat model initialized.")
@@ -27,6 +63,7 @@ agent = create_react_agent(
     model=model,
     tools=get_all_tools(),
     prompt=prompt,
+    pre_model_hook=RunnableLambda(_track_tokens, afunc=_atrack_tokens),
     state_schema=State,
     checkpointer=checkpointer,
 )
@@ -34,11 +71,73 @@ agent = create_react_agent(
 logger.info("Agent initialized.")
 
 
-def call_agent(message):
-    config_dict = {"configurable": {"thread_id": config.THREAD_ID}}
-    response = agent.invoke(
+def _text_delta(chunk, metadata):
+    """The answer text in a streamed message chunk, or "" for anything else."""
+    if metadata.get("langgraph_node") != "agent" or not isinstance(chunk, AIMessageChunk):
+        return ""
+    if chunk.tool_call_chunks or not isinstance(chunk.content, str):
+        return ""
+    return chunk.content
+
+
+async def _run_agent(inputs, config_dict, token=None, on_delta=None):
+    """Run the agent to completion, or until `token` is cancelled.
+
+    With a token the graph is stepped through `astream` so no further LLM or
+    tool calls are started once the turn is superseded. An abandoned run
+    still checkpoints its last completed step; the stream is closed before
+    the cancellation propagates, so that checkpoint is written by the time
+    `acall_agent` discards the turn. `on_delta` receives the model's answer
+    text token by token while it is generated.
+    """
+    if token is None and on_delta is None:
+        return await agent.ainvoke(inputs, config_dict)
+
+    state = None
+    stream = agent.astream(
+        inputs, config_dict, stream_mode=["messages", "values"], checkpoint_during=False
+    )
+    async with aclosing(stream):
+        async for mode, chunk in stream:
+            if token:
+                token.raise_if_cancelled()
+            if mode == "values":
+                state = chunk
+            elif on_delta:
+                delta = _text_delta(*chunk)
+                if delta:
+                    on_delta(delta)
+    return state
+
+
+def call_agent(message, token=None, on_delta=None):
+    """Blocking entry point: run one agent turn on the runtime loop and wait for it.
+
+    `on_delta` is called on the runtime's loop thread and must not block.
+    """
+    return runtime.run(acall_agent(message, token, on_delta), token)
+
+
+async def acall_agent(message, token=None, on_delta=None):
+    """Run one turn; a cancelled turn is removed from the thread's history."""
+    config_dict = {"configurable": {"thread_id": config.THREAD_ID}, "callbacks": [usage_metrics]}
+    if token is None:
+        return await _turn(message, config_dict, token, on_delta)
+    before = await agent.aget_state(config_dict)
+    try:
+        return await _turn(message, config_dict, token, on_delta)
+    except (TurnCancelled, asyncio.CancelledError):
+        # Shielded so a second cancel cannot interrupt the rewind itself
+        await asyncio.shield(discard_turn(agent, config_dict, before))
+        raise
+
+
+async def _turn(message, config_dict, token, on_delta):
+    response = await _run_agent(
         {"messages": [message]},
         config_dict,
+        token,
+        on_delta,
     )
     msg = response["messages"][-1].content
 
@@ -52,7 +151,7 @@ def call_agent(message):
             with open(tool_args, "rb") as image_file:
                 image_data = base64.b64encode(image_file.read()).decode("utf-8")
 
-            response = agent.invoke(
+            response = await _run_agent(
                 {
                     "messages": [
                         {
@@ -68,7 +167,9 @@ def call_agent(message):
                         }
                     ]
                 },
-                config=config_dict,
+                config_dict,
+                token,
+                on_delta,
             )
 
             msg = response["messages"][-1].content
@@ -83,6 +184,69 @@ def call_agent(message):
         return msg
 
 
+_compaction = None  # pending or running compaction job
+
+
+def compact_history():
+    """Summarise the oldest messages once the thread exceeds MAX_TOKENS_HISTORY.
+
+    The new summary and the removal of the summarised messages are written
+    back through the checkpointer, so the next turn starts from the smaller
+    history. Gives up (to retry after the next turn) if a turn started
+    while the summary was being written.
+    """
+    config_dict = {"configurable": {"thread_id": config.THREAD_ID}}
+    state = agent.get_state(config_dict).values
+    messages = state.get("messages", [])
+    # Counts new messages only (the whole history once for an old thread)
+    ledger = update_ledger(state.get("token_ledger"), messages)
+    tokens = ledger["history"]
+    if tokens <= config.MAX_TOKENS_HISTORY:
+        return False
+
+    started = time.perf_counter()
+    logger.info(f"Compacting conversation history ({tokens} tokens)...")
+    result = summarize_conversation(
+        state, max_tokens=config.HISTORY_KEEP_TOKENS, token_counter=count_cached
+    )
+    kept = {m.id for m in result["messages"]}
+    removed = [m for m in messages if m.id not in kept]
+    if not removed:
+        return False
+    if scheduler.busy():
+        logger.info("A turn started while compacting; will retry after it")
+        return False
+
+    ledger = remove_from_ledger(ledger, removed)
+    ledger["summary"] = text_tokens(result["summary"])
+    agent.update_state(
+        config_dict,
+        {
+            "summary": result["summary"],
+            "messages": [RemoveMessage(id=m.id) for m in removed],
+            "token_ledger": ledger,
+        },
+        as_node="agent",
+    )
+    metrics.incr("summary.compactions")
+    metrics.observe("summary.seconds", time.perf_counter() - started)
+    metrics.observe("summary.removed_messages", len(removed))
+    logger.info(
+        f"Compacted history: {len(removed)} messages summarised, "
+        f"{tokens} -> {ledger['history']} tokens"
+    )
+    return True
+
+
+def schedule_compaction():
+    """Queue `compact_history` as background work unless one is already pending."""
+    global _compaction
+    if _compaction is not None and not _compaction.done():
+        return _compaction
+    _compaction = scheduler.submit(BACKGROUND, compact_history)
+    return _compaction
+
+
 if __name__ == "__main__":
     # Run the agent
     message = HumanMessage(content="Hey, how are you doing?")
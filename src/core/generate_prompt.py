@@ -1,37 +1,33 @@
 # generate_prompt.py
+"""Prompt assembly with a byte-stable prefix.
+
+The persona is a constant SystemMessage built once at import. Together
+with the tool schemas, which the model binding sends ahead of the
+messages, it forms a prefix that is identical on every call, so
+provider-side prompt caching can reuse it. Anything that changes between
+calls (the conversation summary) goes in a separate message after it.
+"""
+
+import hashlib
+import json
+import time
 from langchain_core.runnables import RunnableConfig
-from langchain_core.messages import SystemMessage, AIMessage, HumanMessage
+from langchain_core.messages import SystemMessage
 from langchain_core.messages.utils import count_tokens_approximately
+from langchain_core.utils.function_calling import convert_to_openai_tool
 from langgraph.prebuilt.chat_agent_executor import AgentState
 from typing import Any, List
 
 from src.utils.logger import get_logger
-from .summarizer import summarize_conversation
+from src.utils.metrics import metrics
+from .token_ledger import context_tokens
+from .tools import get_all_tools
 from src.config import config
 
 logger = get_logger()
 
-MAX_TOKENS_HISTORY = config.MAX_TOKENS_HISTORY
 
-
-def prompt(state: AgentState, config: RunnableConfig) -> List[Any]:
-    logger.debug("Generating prompt...")
-
-    messages = state.get("messages", [])
-    summary = state.get("summary", "")
-
-    # token_count = count_tokens_approximately(messages)
-
-    # If token count exceeds limit, summarize and trim
-    # if token_count > MAX_TOKENS_HISTORY:
-    #     logger.info("Message history exceeds token limit. Summarizing...")
-    #     summary_result = summarize_conversation(state, max_tokens=MAX_TOKENS_HISTORY)
-    #     summary = summary_result.get("summary", summary)
-    #     # Update state in-place
-    #     state["summary"] = summary
-    #     state["messages"] = summary_result["messages"]
-
-    system_msg = f"""
+PERSONA = """
 You are **Jasper**, a witty, intelligent desktop AI assistant running locally on *Harsh Bansal*'s Linux machine.
 
 ### 🧠 Your Purpose:
@@ -66,8 +62,57 @@ Help Harsh—20-year-old tech-savvy student from **IIT Kharagpur**, India—with
 * **Occupation**: Student
 * **College**: IIT Kharagpur
 * **Interests**: Technology, AI, Programming
-
-{f"\n### 📜 Previous Conversation:\n{summary}" if summary else ""}
 """.strip()
 
-    return [SystemMessage(content=system_msg)] + state["messages"]
+
+def _persona_message():
+    if config.LLM_PROVIDER == "anthropic":
+        # Anthropic only caches up to an explicit breakpoint (tools + system)
+        return SystemMessage(
+            content=[{"type": "text", "text": PERSONA, "cache_control": {"type": "ephemeral"}}]
+        )
+    return SystemMessage(content=PERSONA)
+
+
+PERSONA_MESSAGE = _persona_message()
+
+# Counted once for the token ledger; the summary is counted separately
+SYSTEM_TOKENS = count_tokens_approximately([SystemMessage(content=PERSONA)])
+
+
+def prefix_hash():
+    """Fingerprint of the cacheable prefix: persona plus tool schemas."""
+    tools = [convert_to_openai_tool(tool) for tool in get_all_tools()]
+    payload = json.dumps({"persona": PERSONA, "tools": tools}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:12]
+
+
+logger.info(f"Prompt prefix {prefix_hash()} ({SYSTEM_TOKENS} persona tokens)")
+
+_summary_message = (None, None)  # (summary, message) of the last call
+
+
+def _summary(summary):
+    """The summary message, rebuilt only when the summary changes."""
+    global _summary_message
+    if _summary_message[0] != summary:
+        _summary_message = (summary, SystemMessage(content=f"### 📜 Previous Conversation:\n{summary}"))
+    return _summary_message[1]
+
+
+def prompt(state: AgentState, config: RunnableConfig) -> List[Any]:
+    started = time.perf_counter()
+    summary = state.get("summary", "")
+    ledger = state.get("token_ledger")
+    if ledger:
+        logger.debug(f"Generating prompt ({context_tokens(ledger)} tokens of context)...")
+
+    # History beyond MAX_TOKENS_HISTORY is summarised in the background after
+    # each turn (see assistant.compact_history), never here on the hot path.
+    messages = [PERSONA_MESSAGE]
+    if summary:
+        messages.append(_summary(summary))
+    messages += state["messages"]
+
+    metrics.observe("prompt.build", time.perf_counter() - started)
+    return messages
@@ -1,4 +1,6 @@
 from langchain.chat_models import init_chat_model
+from langchain_core.callbacks import BaseCallbackHandler
+from src.utils.metrics import metrics
 from src.config import config
 
 
@@ -8,3 +10,35 @@ model = init_chat_model(
     temperature=config.LLM_TEMPERATURE,
     api_key=config.LLM_API_KEY,
 )
+
+# Used off the hot path (history compaction), so cheap beats clever
+summary_model = init_chat_model(
+    model=config.SUMMARY_LLM_MODEL,
+    model_provider=config.SUMMARY_LLM_PROVIDER,
+    temperature=0,
+    api_key=config.LLM_API_KEY,
+)
+
+
+class UsageMetrics(BaseCallbackHandler):
+    """Records prompt size and provider-side prompt cache reuse per LLM call.
+
+    `llm.prefix_reuse` is the share of input tokens served from the
+    provider's prompt cache (0 where the provider does not report it).
+    """
+
+    def on_llm_end(self, response, **kwargs):
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if not usage:
+                    continue
+                input_tokens = usage.get("input_tokens", 0)
+                cached = (usage.get("input_token_details") or {}).get("cache_read", 0)
+                metrics.observe("llm.input_tokens", input_tokens)
+                metrics.observe("llm.cache_read_tokens", cached)
+                if input_tokens:
+                    metrics.observe("llm.prefix_reuse", cached / input_tokens)
+
+
+usage_metrics = UsageMetrics()
@@ -1,31 +1,39 @@
 from langchain_core.messages import HumanMessage
 from langgraph.prebuilt.chat_agent_executor import AgentState
-from langchain_core.messages.utils import count_tokens_approximately, trim_messages
-from src.core.llm import model
-
-
-def summarize_conversation(state: AgentState, max_tokens: int = 1000):
+from langchain_core.messages.utils import count_tokens_approximately
+from src.core.llm import summary_model
+
+
+def recent_turns_start(messages, max_tokens, token_counter=count_tokens_approximately):
+    """Index of the first message kept verbatim when compacting `messages`.
+
+    The cut always falls on a HumanMessage, so a turn (the user's message,
+    any tool calls with their results, and the final answer) is kept or
+    summarised as a whole. Whole turns are kept from the end while they fit
+    in `max_tokens`; the last turn is always kept. Returns 0 when there is
+    nothing older to summarise.
+    """
+    starts = [i for i, m in enumerate(messages) if isinstance(m, HumanMessage)]
+    if not starts:
+        return 0
+    cut = starts[-1]
+    tokens = token_counter(messages[cut:])
+    for start in reversed(starts[:-1]):
+        tokens += token_counter(messages[start:cut])
+        if tokens > max_tokens:
+            break
+        cut = start
+    return cut
+
+
+def summarize_conversation(state: AgentState, max_tokens: int = 1000, token_counter=None):
     summary = state.get("summary", "")
     messages = state.get("messages", [])
     if len(messages) < 4:
         return {"summary": summary, "messages": messages}
 
-    recent_messages = trim_messages(
-        messages=messages,
-        strategy="last",
-        token_counter=count_tokens_approximately,
-        max_tokens=max_tokens,
-        start_on="human",
-        end_on=("human", "tool"),
-        include_system=True,
-        allow_partial=False,
-    )
-
-    if len(recent_messages) <= 4:
-        kept_ids = {m.id for m in messages[-4:] if hasattr(m, "id")}
-    else:
-        kept_ids = {m.id for m in recent_messages if hasattr(m, "id")}
-    old_messages = [m for m in messages if hasattr(m, "id") and m.id not in kept_ids]
+    cut = recent_turns_start(messages, max_tokens, token_counter or count_tokens_approximately)
+    old_messages = messages[:cut]
 
     if not old_messages:
         return {"summary": summary, "messages": messages}
@@ -39,9 +47,9 @@ def summarize_conversation(state: AgentState, max_tokens: int = 1000):
         prompt = "Create a summary of the conversation above (don't include this instruction in the summary):"
 
     summarization_input = old_messages + [HumanMessage(content=prompt)]
-    response = model.invoke(summarization_input)
+    response = summary_model.invoke(summarization_input)
 
     return {
         "summary": response.content,
-        "messages": recent_messages
+        "messages": messages[cut:]
     }
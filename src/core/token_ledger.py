@@ -0,0 +1,112 @@
+# token_ledger.py
+"""Token totals of the agent's context kept in the agent state, so budgets are O(1) per turn.
+
+The ledger is a small plain dict stored under `token_ledger`:
+
+    {
+        "last": id of the newest message counted so far,
+        "history": tokens of all messages,
+        "tool": tokens of tool outputs,
+        "images": tokens of image inputs,
+        "summary": tokens of the conversation summary,
+        "system": tokens of the static system prompt,
+    }
+
+Messages are only ever appended, so the ones after `last` are the ones not
+yet counted; removing messages (history compaction) subtracts their counts.
+Per-message counts are derived lazily and cached in memory by message id,
+so neither the state update nor the checkpoint grows with the history.
+Images are counted at a flat IMAGE_TOKENS each instead of by the length
+of their base64 payload.
+"""
+
+from langchain_core.messages import ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from src.config import config
+
+TOTALS = ("history", "tool", "images", "summary", "system")
+
+_counts = {}  # message id -> (tokens, tool_tokens, image_tokens)
+
+
+def new_ledger():
+    return {"last": None, **{name: 0 for name in TOTALS}}
+
+
+def _is_image(part):
+    return isinstance(part, dict) and part.get("type") in ("image_url", "image")
+
+
+def message_tokens(message):
+    """Approximate (tokens, image_tokens) of one message."""
+    content = message.content
+    if not isinstance(content, list) or not any(_is_image(part) for part in content):
+        return count_tokens_approximately([message]), 0
+    images = sum(1 for part in content if _is_image(part))
+    text = [part for part in content if not _is_image(part)]
+    image_tokens = images * config.IMAGE_TOKENS
+    return count_tokens_approximately([message.model_copy(update={"content": text})]) + image_tokens, image_tokens
+
+
+def text_tokens(text):
+    return count_tokens_approximately([text]) if text else 0
+
+
+def counts(message):
+    """(tokens, tool_tokens, image_tokens) of one message, counted once per process."""
+    cached = _counts.get(message.id)
+    if cached is None:
+        tokens, image_tokens = message_tokens(message)
+        tool_tokens = tokens if isinstance(message, ToolMessage) else 0
+        cached = _counts[message.id] = (tokens, tool_tokens, image_tokens)
+    return cached
+
+
+def count_cached(messages):
+    """A `trim_messages`-style token counter backed by the per-message cache."""
+    return sum(counts(m)[0] for m in messages)
+
+
+def update_ledger(ledger, messages):
+    """Return a ledger that also counts the messages after `ledger["last"]`.
+
+    The scan walks back from the end and stops at the last counted message.
+    A ledger from an older format, or one whose last message is no longer
+    in the history, is rebuilt from the whole history.
+    """
+    if not ledger or "last" not in ledger:
+        ledger = new_ledger()
+    ledger = {**ledger}
+    new = []
+    for message in reversed(messages):
+        if message.id == ledger["last"]:
+            break
+        new.append(message)
+    else:
+        if ledger["last"] is not None:
+            ledger.update({name: 0 for name in ("history", "tool", "images")})
+    for message in new:
+        tokens, tool_tokens, image_tokens = counts(message)
+        ledger["history"] += tokens
+        ledger["tool"] += tool_tokens
+        ledger["images"] += image_tokens
+    if messages:
+        ledger["last"] = messages[-1].id
+    return ledger
+
+
+def remove_from_ledger(ledger, messages):
+    """Return a ledger without the counts of `messages`."""
+    ledger = {**ledger}
+    for message in messages:
+        tokens, tool_tokens, image_tokens = counts(message)
+        _counts.pop(message.id, None)
+        ledger["history"] -= tokens
+        ledger["tool"] -= tool_tokens
+        ledger["images"] -= image_tokens
+    return ledger
+
+
+def context_tokens(ledger):
+    """Tokens sent to the model on the next call: system prompt, summary and history."""
+    return ledger["system"] + ledger["summary"] + ledger["history"]
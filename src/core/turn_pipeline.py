@@ -0,0 +1,170 @@
+# turn_pipeline.py
+"""Staged voice turn processing: capture -> STT -> agent -> TTS."""
+
+import itertools
+import queue
+import threading
+import time
+from src.utils.cancellation import CancellationToken, TurnCancelled
+from src.utils.logger import get_logger
+from src.utils.metrics import metrics
+from src.utils.scheduler import TURN, scheduler
+from src.config import config
+
+logger = get_logger()
+
+_turn_ids = itertools.count(1)
+
+
+class Turn:
+    """One user request as it moves through the pipeline."""
+
+    def __init__(self, audio=None, query=None):
+        self.id = next(_turn_ids)
+        self.audio = audio
+        self.query = query
+        self.response = None
+        self.speech = None  # SpeechStream when the response is spoken while generated
+        self.token = CancellationToken()
+        self.created_at = time.perf_counter()
+        self.enqueued_at = self.created_at
+
+
+class Stage(threading.Thread):
+    """A worker thread draining a bounded queue into `handler`.
+
+    The handler receives a Turn and returns it (to pass it on to the next
+    stage) or None (to end the turn here). Cancelled turns are skipped, and a
+    handler may raise TurnCancelled to abandon one midway. Queue depth, time
+    spent waiting in the queue and handler time are recorded per stage.
+    """
+
+    def __init__(self, name, handler, maxsize, next_stage=None, on_done=None):
+        super().__init__(name=f"stage-{name}", daemon=True)
+        self.stage_name = name
+        self.handler = handler
+        self.next_stage = next_stage
+        self.on_done = on_done
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.running = True
+
+    def put(self, turn):
+        """Enqueue without blocking; returns False if the stage is saturated."""
+        turn.enqueued_at = time.perf_counter()
+        try:
+            self.queue.put_nowait(turn)
+        except queue.Full:
+            metrics.incr(f"pipeline.{self.stage_name}.dropped")
+            logger.warning(f"⚠️ {self.stage_name} queue full, dropping turn {turn.id}")
+            if self.on_done:
+                self.on_done(turn)
+            return False
+        metrics.gauge(f"pipeline.{self.stage_name}.depth", self.queue.qsize())
+        return True
+
+    def run(self):
+        scheduler.set_priority(TURN)
+        while self.running:
+            try:
+                turn = self.queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            started = time.perf_counter()
+            metrics.observe(f"pipeline.{self.stage_name}.wait", started - turn.enqueued_at)
+            metrics.gauge(f"pipeline.{self.stage_name}.depth", self.queue.qsize())
+            try:
+                turn.token.raise_if_cancelled()
+                # Counted as turn work, so background jobs wait until it is done
+                with scheduler.running(TURN):
+                    result = self.handler(turn)
+            except TurnCancelled:
+                metrics.incr(f"pipeline.{self.stage_name}.cancelled")
+                logger.debug(f"Turn {turn.id} cancelled in {self.stage_name} stage")
+                result = None
+            except Exception as e:
+                logger.error(f"Error in {self.stage_name} stage for turn {turn.id}: {e}")
+                result = None
+            finally:
+                metrics.observe(f"pipeline.{self.stage_name}.busy", time.perf_counter() - started)
+                self.queue.task_done()
+
+            if result is not None and self.next_stage:
+                if self.next_stage.put(result):
+                    continue
+            if self.on_done:
+                self.on_done(turn)
+
+    def stats(self):
+        snapshot = metrics.snapshot()
+        prefix = f"pipeline.{self.stage_name}."
+        return {
+            "depth": self.queue.qsize(),
+            "wait": snapshot["observations"].get(prefix + "wait"),
+            "busy": snapshot["observations"].get(prefix + "busy"),
+            "dropped": snapshot["counters"].get(prefix + "dropped", 0),
+        }
+
+
+class TurnPipeline:
+    """Wires the STT, agent and TTS stages together with bounded queues.
+
+    The listener (capture) only enqueues a recording and goes straight back
+    to wake word detection; each later stage runs on its own thread.
+    """
+
+    def __init__(self, transcribe, respond, speak, maxsize=None):
+        maxsize = maxsize or config.TURN_QUEUE_SIZE
+        self.lock = threading.Lock()
+        self.active = {}  # turns that have not left the pipeline yet
+        self.speaking = None  # last turn handed to the speech player
+        self.speak = speak
+        self.tts = Stage("tts", self._speak, maxsize, on_done=self._finish)
+        self.agent = Stage("agent", respond, maxsize, next_stage=self.tts, on_done=self._finish)
+        self.stt = Stage("stt", transcribe, maxsize, next_stage=self.agent, on_done=self._finish)
+        self.stages = (self.stt, self.agent, self.tts)
+
+    def _track(self, turn):
+        with self.lock:
+            self.active[turn.id] = turn
+        return turn
+
+    def _finish(self, turn):
+        with self.lock:
+            self.active.pop(turn.id, None)
+
+    def _speak(self, turn):
+        # Playback outlives the stage, so remember the turn for barge-in
+        self.speaking = turn
+        return self.speak(turn)
+
+    def cancel_active(self):
+        """Barge-in: cancel every turn still in STT, the agent or being spoken."""
+        with self.lock:
+            turns = list(self.active.values())
+        if self.speaking is not None and self.speaking.id not in self.active:
+            turns.append(self.speaking)
+        turns = [turn for turn in turns if not turn.token.cancelled]
+        for turn in turns:
+            logger.info(f"Cancelling superseded turn {turn.id}")
+            turn.token.cancel()
+        return len(turns)
+
+    def start(self):
+        for stage in self.stages:
+            stage.start()
+
+    def submit_audio(self, audio):
+        """Entry point for the capture stage."""
+        return self.stt.put(self._track(Turn(audio=audio)))
+
+    def submit_query(self, query):
+        """Entry point for typed queries, which skip STT."""
+        return self.agent.put(self._track(Turn(query=query)))
+
+    def stats(self):
+        return {stage.stage_name: stage.stats() for stage in self.stages}
+
+    def shutdown(self):
+        for stage in self.stages:
+            stage.running = False
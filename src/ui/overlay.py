@@ -20,7 +20,6 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt, QTimer, QSize
 from PyQt5.QtGui import QFont
 from queue import Queue
-from src.utils.thread_executor import executor
 
 from src.utils.logger import get_logger
 from src.config import config
@@ -45,6 +44,7 @@ class TransparentOverlayQt(QMainWindow):
         self.message_queue = Queue()
         self.running = True
         self.on_new_message = None
+        self.partial_label = None  # response still being generated
 
         # Set up the UI
         self.setup_ui()
@@ -181,8 +181,10 @@ class TransparentOverlayQt(QMainWindow):
         label.setStyleSheet(f"color: {color};")
         label.setWordWrap(True)
         self.log_layout.insertWidget(self.log_layout.count() - 1, label)
+        self.scroll_to_bottom()
+        return label
 
-        # Auto-scroll to bottom
+    def scroll_to_bottom(self):
         QTimer.singleShot(
             50,
             lambda: self.scroll_area.verticalScrollBar().setValue(
@@ -208,11 +210,25 @@ class TransparentOverlayQt(QMainWindow):
 
                 elif msg_type == "query":
                     text = args[0]
+                    self.partial_label = None
                     self.add_log_message(f"You: {text}", "#00FFFF")  # Cyan
 
+                elif msg_type == "partial":
+                    # Grows in place while the response streams in
+                    text = args[0]
+                    if self.partial_label is None:
+                        self.partial_label = self.add_log_message(f"Jasper: {text}", "#00FF00")
+                    else:
+                        self.partial_label.setText(f"Jasper: {text}")
+                        self.scroll_to_bottom()
+
                 elif msg_type == "response":
                     text = args[0]
-                    self.add_log_message(f"Jasper: {text}", "#00FF00")  # Green
+                    if self.partial_label is not None:
+                        self.partial_label.setText(f"Jasper: {text}")
+                        self.partial_label = None
+                    else:
+                        self.add_log_message(f"Jasper: {text}", "#00FF00")  # Green
 
             except Exception as e:
                 logger.error(f"Error processing message: {e}")
@@ -231,7 +247,8 @@ class TransparentOverlayQt(QMainWindow):
         self.input_box.clear()
         if message:
             if self.on_new_message:
-                executor.submit(self.on_new_message, message)
+                # Only queues the query, so it is safe on the UI thread
+                self.on_new_message(message)
 
 
 app = QApplication(sys.argv)
@@ -0,0 +1,31 @@
+# async_runtime.py
+"""A persistent asyncio event loop for code that otherwise runs on threads."""
+
+import asyncio
+import threading
+
+
+class AsyncLoopThread(threading.Thread):
+    """Runs one asyncio event loop forever on a daemon thread.
+
+    Replaces per-call `asyncio.run`, which builds and tears down a loop (and
+    everything bound to it) every time. Coroutines are scheduled from any
+    thread with `submit`, which returns a concurrent.futures.Future.
+    """
+
+    def __init__(self, name="async-loop"):
+        super().__init__(name=name, daemon=True)
+        self.loop = asyncio.new_event_loop()
+
+    def run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def call_soon(self, callback, *args):
+        self.loop.call_soon_threadsafe(callback, *args)
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
@@ -0,0 +1,62 @@
+# cancellation.py
+"""Cooperative cancellation tokens for abandoning superseded turns."""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from src.utils.logger import get_logger
+
+logger = get_logger()
+
+
+class TurnCancelled(Exception):
+    """Raised when work for a cancelled turn is abandoned."""
+
+
+class CancellationToken:
+    """A one-shot cancellation flag shared by everything working on one turn.
+
+    Long-running steps either poll `cancelled`, wait through `result()`, or
+    register cleanup with `on_cancel` (e.g. dropping queued speech).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._callbacks = []
+        self._future = Future()  # completes on cancel, so it can be waited on
+        self.cancelled_at = None
+
+    @property
+    def cancelled(self):
+        return self.cancelled_at is not None
+
+    def cancel(self):
+        with self._lock:
+            if self.cancelled_at is not None:
+                return
+            self.cancelled_at = time.perf_counter()
+            callbacks, self._callbacks = self._callbacks, []
+        self._future.set_result(None)
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Error in cancellation callback: {e}")
+
+    def on_cancel(self, callback):
+        """Run `callback` on cancellation (immediately if already cancelled)."""
+        with self._lock:
+            if self.cancelled_at is None:
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def raise_if_cancelled(self):
+        if self.cancelled:
+            raise TurnCancelled()
+
+    def result(self, future, timeout=None):
+        """Wait for `future`, raising TurnCancelled as soon as the token is cancelled."""
+        wait((future, self._future), timeout=timeout, return_when=FIRST_COMPLETED)
+        self.raise_if_cancelled()
+        return future.result(timeout=0)
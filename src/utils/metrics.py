@@ -0,0 +1,58 @@
+# metrics.py
+"""Lightweight in-process counters and timing statistics."""
+
+import threading
+
+
+class Metrics:
+    """Thread-safe registry of named counters, gauges and observations."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._gauges = {}
+        self._observations = {}
+
+    def incr(self, name, value=1):
+        """Increase counter `name` by `value`."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def gauge(self, name, value):
+        """Set gauge `name` to its latest `value`."""
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name, value):
+        """Record one sample of `name` (e.g. a latency in seconds)."""
+        with self._lock:
+            stats = self._observations.get(name)
+            if stats is None:
+                self._observations[name] = {
+                    "count": 1, "total": value, "min": value, "max": value, "last": value
+                }
+                return
+            stats["count"] += 1
+            stats["total"] += value
+            stats["last"] = value
+            if value < stats["min"]:
+                stats["min"] = value
+            if value > stats["max"]:
+                stats["max"] = value
+
+    def snapshot(self):
+        """Return a copy of every metric, with the mean added to observations."""
+        with self._lock:
+            observations = {
+                name: {**stats, "mean": stats["total"] / stats["count"]}
+                for name, stats in self._observations.items()
+            }
+            return {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "observations": observations,
+            }
+
+
+# Create a global metrics instance
+metrics = Metrics()
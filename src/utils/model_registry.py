@@ -0,0 +1,86 @@
+# model_registry.py
+"""Process-wide registry that loads each model lazily and exactly once."""
+
+import os
+import threading
+import time
+from src.utils.logger import get_logger
+
+logger = get_logger()
+
+
+def resident_memory():
+    """Current resident set size of this process in bytes (Linux)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+class ModelRegistry:
+    """Holds shared model instances keyed by name.
+
+    Loaders are registered up front (cheap) and only run the first time a
+    model is requested; every later `get` returns the same object. Load time
+    and the growth in resident memory during the load are recorded per model.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaders = {}
+        self._unloaders = {}
+        self._load_locks = {}
+        self._models = {}
+        self._stats = {}
+
+    def register(self, name, loader, unloader=None):
+        """Register `loader()` for `name`; `unloader(model)` runs on `unload`."""
+        with self._lock:
+            self._loaders[name] = loader
+            self._load_locks[name] = threading.Lock()
+            if unloader:
+                self._unloaders[name] = unloader
+
+    def get(self, name):
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        if name not in self._loaders:
+            raise KeyError(f"No model registered as '{name}'")
+
+        with self._load_locks[name]:
+            # Another thread may have finished loading while we waited
+            if name in self._models:
+                return self._models[name]
+
+            rss_before = resident_memory()
+            start = time.perf_counter()
+            model = self._loaders[name]()
+            load_seconds = time.perf_counter() - start
+            rss_bytes = max(0, resident_memory() - rss_before)
+
+            self._models[name] = model
+            self._stats[name] = {"load_seconds": load_seconds, "rss_bytes": rss_bytes}
+            logger.info(
+                f"Loaded model '{name}' in {load_seconds:.2f}s (+{rss_bytes / 2**20:.1f} MiB RSS)"
+            )
+            return model
+
+    def is_loaded(self, name):
+        return name in self._models
+
+    def unload(self, name):
+        with self._load_locks.get(name, self._lock):
+            model = self._models.pop(name, None)
+            if model is not None and name in self._unloaders:
+                self._unloaders[name](model)
+
+    def stats(self):
+        """Load time and resident memory growth for every loaded model."""
+        return {name: dict(stats) for name, stats in self._stats.items()}
+
+
+# Create a global registry instance
+registry = ModelRegistry()
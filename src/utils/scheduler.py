@@ -0,0 +1,175 @@
+# scheduler.py
+"""Priority classes for the assistant's threads: realtime, turn and background.
+
+* realtime:   audio capture and wake word detection, on a dedicated thread
+              with raised OS priority; never shares a thread with anything.
+* turn:       latency-sensitive work for the current turn (STT, agent, TTS).
+* background: deferrable work such as summarisation and cache warm-ups. It
+              runs at the lowest OS priority, and is only admitted while no
+              turn work is in progress.
+
+Priorities are Linux nice values applied per thread; raising one needs
+CAP_SYS_NICE (or a negative RLIMIT_NICE), otherwise the thread keeps the
+default priority and a warning is logged once.
+"""
+
+import contextlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.utils.logger import get_logger
+from src.utils.metrics import metrics
+from src.config import config
+
+logger = get_logger()
+
+REALTIME = "realtime"
+TURN = "turn"
+BACKGROUND = "background"
+
+
+class WorkClass:
+    """Priority and limits of one class of work."""
+
+    def __init__(self, name, nice, workers=0, queue_size=0):
+        self.name = name
+        self.nice = nice
+        self.workers = workers  # pooled threads for `submit`; 0 = dedicated threads only
+        self.queue_size = queue_size  # pending `submit` calls before new ones are rejected
+
+
+def default_classes():
+    return {
+        REALTIME: WorkClass(REALTIME, config.SCHED_REALTIME_NICE),
+        TURN: WorkClass(TURN, config.SCHED_TURN_NICE, config.SCHED_TURN_WORKERS, config.SCHED_TURN_QUEUE),
+        BACKGROUND: WorkClass(
+            BACKGROUND, config.SCHED_BACKGROUND_NICE,
+            config.SCHED_BACKGROUND_WORKERS, config.SCHED_BACKGROUND_QUEUE,
+        ),
+    }
+
+
+class Scheduler:
+    """Runs work in its priority class, with per-class limits and admission control.
+
+    `thread` starts a dedicated thread in a class (used for capture);
+    `submit` queues a call on the class's bounded pool and returns a
+    Future, or None when the class is saturated. Turn stages wrap their
+    work in `running(TURN)`; background jobs wait for that count to reach
+    zero before they start, so they never compete with a live turn.
+
+    Per class: `sched.<class>.queued` (gauge), `.wait` and `.run`
+    (seconds), and `.rejected` (counter).
+    """
+
+    def __init__(self, classes=None):
+        self.classes = classes or default_classes()
+        self.cond = threading.Condition()
+        self.active = {name: 0 for name in self.classes}
+        self.pending = {name: 0 for name in self.classes}
+        self.pools = {}
+        self.closed = False
+        self.warned = False
+
+    def set_priority(self, name):
+        """Apply class `name`'s priority to the calling thread."""
+        nice = self.classes[name].nice
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), nice)
+        except (AttributeError, OSError) as e:
+            if not self.warned:
+                self.warned = True
+                logger.warning(f"⚠️ Could not set {name} thread priority (nice {nice}): {e}")
+
+    def thread(self, name, target, *args, thread_name=None):
+        """Start `target(*args)` on a new daemon thread running at class `name`'s priority."""
+
+        def run():
+            self.set_priority(name)
+            target(*args)
+
+        thread = threading.Thread(target=run, name=thread_name or name, daemon=True)
+        thread.start()
+        return thread
+
+    @contextlib.contextmanager
+    def running(self, name):
+        """Count the enclosed block as active work of class `name`."""
+        with self.cond:
+            self.active[name] += 1
+        try:
+            yield
+        finally:
+            with self.cond:
+                self.active[name] -= 1
+                self.cond.notify_all()
+
+    def busy(self):
+        """Whether any turn work is in progress."""
+        return self.active[TURN] > 0
+
+    def _pool(self, name):
+        pool = self.pools.get(name)
+        if pool is None:
+            pool = ThreadPoolExecutor(
+                max_workers=self.classes[name].workers,
+                thread_name_prefix=f"sched-{name}",
+                initializer=self.set_priority,
+                initargs=(name,),
+            )
+            self.pools[name] = pool
+        return pool
+
+    def _admit(self, name):
+        """Wait until work of class `name` may start; False once shut down."""
+        with self.cond:
+            if name == BACKGROUND:
+                # Background work is held back while a turn is in progress
+                self.cond.wait_for(lambda: self.closed or not self.busy())
+            self.pending[name] -= 1
+            metrics.gauge(f"sched.{name}.queued", self.pending[name])
+            return not self.closed
+
+    def submit(self, name, fn, *args, **kwargs):
+        """Queue `fn(*args, **kwargs)` in class `name`; returns a Future, or None if rejected."""
+        work_class = self.classes[name]
+        if not work_class.workers:
+            raise ValueError(f"{name} work has no pool; start a dedicated thread instead")
+        with self.cond:
+            if self.pending[name] >= work_class.queue_size:
+                metrics.incr(f"sched.{name}.rejected")
+                logger.warning(f"⚠️ {name} queue full, rejecting {getattr(fn, '__name__', fn)}")
+                return None
+            self.pending[name] += 1
+            metrics.gauge(f"sched.{name}.queued", self.pending[name])
+            pool = self._pool(name)
+        submitted = time.perf_counter()
+
+        def job():
+            if not self._admit(name):
+                return None
+            started = time.perf_counter()
+            metrics.observe(f"sched.{name}.wait", started - submitted)
+            try:
+                with self.running(name):
+                    return fn(*args, **kwargs)
+            finally:
+                metrics.observe(f"sched.{name}.run", time.perf_counter() - started)
+
+        return pool.submit(job)
+
+    def stats(self):
+        with self.cond:
+            return {name: {"active": self.active[name], "queued": self.pending[name]} for name in self.classes}
+
+    def shutdown(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+        for pool in self.pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Create a global scheduler instance
+scheduler = Scheduler()
@@ -0,0 +1,100 @@
+import asyncio
+from contextlib import aclosing
+
+import pytest
+
+pytest.importorskip("langgraph")
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.tools import tool
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.prebuilt import create_react_agent
+
+from src.core.agent_runtime import discard_turn
+
+
+class _ToolCallingFake(GenericFakeChatModel):
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+def _tool_call(name):
+    return AIMessage(content="", tool_calls=[{"name": name, "args": {"query": "x"}, "id": "call-1"}])
+
+
+def _contents(messages):
+    return [m.content for m in messages]
+
+
+@pytest.mark.parametrize("earlier_turn", [False, True])
+def test_turn_cancelled_during_a_tool_call_is_discarded(earlier_turn):
+    async def scenario():
+        tool_started = asyncio.Event()
+
+        @tool
+        async def slow_lookup(query: str) -> str:
+            """Look something up slowly."""
+            tool_started.set()
+            await asyncio.sleep(60)
+            return "never"
+
+        replies = [AIMessage(content="First answer")] if earlier_turn else []
+        replies += [_tool_call("slow_lookup"), AIMessage(content="Next answer")]
+        agent = create_react_agent(
+            model=_ToolCallingFake(messages=iter(replies)), tools=[slow_lookup], checkpointer=InMemorySaver()
+        )
+        config_dict = {"configurable": {"thread_id": "t"}}
+        if earlier_turn:
+            await agent.ainvoke({"messages": [HumanMessage("hello")]}, config_dict)
+        before = await agent.aget_state(config_dict)
+
+        async def abandoned_turn():
+            async for _ in agent.astream(
+                {"messages": [HumanMessage("abandoned")]}, config_dict, checkpoint_during=False
+            ):
+                pass
+
+        task = asyncio.create_task(abandoned_turn())
+        await tool_started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert await discard_turn(agent, config_dict, before) == 2
+        state = await agent.aget_state(config_dict)
+        assert _contents(state.values["messages"]) == _contents(before.values.get("messages", []))
+        return await agent.ainvoke({"messages": [HumanMessage("next")]}, config_dict)
+
+    messages = asyncio.run(scenario())["messages"]
+    assert "abandoned" not in _contents(messages)
+    assert messages[-1].content == "Next answer"
+
+
+def test_stream_abandoned_between_steps_is_discarded_after_close():
+    @tool
+    def lookup(query: str) -> str:
+        """Look something up."""
+        return "found"
+
+    model = _ToolCallingFake(messages=iter([_tool_call("lookup"), AIMessage(content="Next answer")]))
+    agent = create_react_agent(model=model, tools=[lookup], checkpointer=InMemorySaver())
+    config_dict = {"configurable": {"thread_id": "t"}}
+
+    class Superseded(Exception):
+        pass
+
+    async def scenario():
+        before = await agent.aget_state(config_dict)
+        stream = agent.astream(
+            {"messages": [HumanMessage("abandoned")]}, config_dict, checkpoint_during=False
+        )
+        with pytest.raises(Superseded):
+            async with aclosing(stream):
+                async for _ in stream:
+                    raise Superseded  # stop right after the model's tool call
+
+        assert await discard_turn(agent, config_dict, before) == 2
+        return await agent.ainvoke({"messages": [HumanMessage("next")]}, config_dict)
+
+    assert _contents(asyncio.run(scenario())["messages"]) == ["next", "Next answer"]
@@ -0,0 +1,58 @@
+import sys
+import types
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+try:
+    import sounddevice  # noqa: F401
+except (ImportError, OSError):
+    # No PortAudio on headless machines; the tests replace InputStream anyway
+    sys.modules["sounddevice"] = types.ModuleType("sounddevice")
+
+from src.audio import capture as capture_module
+
+
+class _FakeStream:
+    def __init__(self, **kwargs):
+        self.callback = kwargs["callback"]
+
+
+class _Status:
+    input_overflow = False
+
+
+@pytest.fixture
+def ring(monkeypatch):
+    monkeypatch.setattr(capture_module.sd, "InputStream", _FakeStream, raising=False)
+    capture = capture_module.AudioCapture(sample_rate=4, frame_length=2, buffer_seconds=2)
+    capture.running = True
+    return capture
+
+
+def _write(capture, value):
+    block = np.full((capture.frame_length, 1), value, dtype=np.int16)
+    capture._callback(block, capture.frame_length, None, _Status())
+
+
+def test_reader_one_full_ring_behind_skips_overwritten_slot(ring):
+    assert ring.capacity == 4
+    reader = ring.reader("slow", position=0)
+    for value in range(ring.capacity):
+        _write(ring, value)
+
+    # Exactly one ring behind: frame 0 lives in the slot the writer fills next
+    frame = reader.read(timeout=0)
+    assert reader.overruns == 1
+    assert frame[0] == 1
+    assert reader.position == 2
+
+
+def test_reader_inside_ring_reads_without_overrun(ring):
+    reader = ring.reader("fast", position=0)
+    for value in range(ring.capacity - 1):
+        _write(ring, value)
+
+    assert reader.read(timeout=0)[0] == 0
+    assert reader.overruns == 0
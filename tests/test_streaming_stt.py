@@ -0,0 +1,66 @@
+import asyncio
+import threading
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("langchain_core")
+pytest.importorskip("soundfile")
+
+from src.audio.streaming_stt import StreamingTranscriber
+from src.audio.transcription import Transcriber
+from src.core.agent_runtime import AgentRuntime
+from src.utils.cancellation import CancellationToken, TurnCancelled
+
+
+class _HangingTranscriber(Transcriber):
+    """Stands in for an HTTP request that never answers."""
+
+    name = "hanging"
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.closed = threading.Event()
+
+    async def _atranscribe(self, audio):
+        self.started.set()
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            self.closed.set()
+            raise
+
+
+@pytest.fixture
+def runtime():
+    runtime = AgentRuntime(max_concurrency=1, tool_workers=1)
+    yield runtime
+    runtime.shutdown()
+
+
+def test_cancelling_a_turn_cancels_in_flight_segment_requests(runtime):
+    transcriber = _HangingTranscriber()
+    session = StreamingTranscriber(runtime, transcriber).begin()
+    token = CancellationToken()
+
+    session.add_segment(np.zeros(16000, dtype=np.int16))
+    assert transcriber.started.wait(1)
+    threading.Timer(0.05, token.cancel).start()
+
+    with pytest.raises(TurnCancelled):
+        session.result(token)
+    assert transcriber.closed.wait(1)
+
+
+def test_run_io_does_not_take_an_agent_slot(runtime):
+    async def hold():
+        await asyncio.sleep(60)
+
+    async def answer():
+        return "ok"
+
+    held = runtime.submit(hold())
+    try:
+        assert runtime.run_io(answer()) == "ok"
+    finally:
+        held.cancel()
@@ -0,0 +1,73 @@
+import importlib
+import sys
+import types
+
+import pytest
+
+pytest.importorskip("langgraph")
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+
+class _FakeSummaryModel:
+    def __init__(self):
+        self.inputs = []
+
+    def invoke(self, messages):
+        self.inputs.append(messages)
+        return AIMessage(content="summary")
+
+
+@pytest.fixture
+def summarizer(monkeypatch):
+    model = _FakeSummaryModel()
+    monkeypatch.setitem(sys.modules, "src.core.llm", types.SimpleNamespace(summary_model=model))
+    monkeypatch.delitem(sys.modules, "src.core.summarizer", raising=False)
+    module = importlib.import_module("src.core.summarizer")
+    module.fake_model = model
+    return module
+
+
+def _one_token_each(messages):
+    return len(messages)
+
+
+def _turn(n, tool=False):
+    messages = [HumanMessage(f"question {n}", id=f"h{n}")]
+    if tool:
+        messages += [
+            AIMessage("", id=f"c{n}", tool_calls=[{"name": "lookup", "args": {}, "id": f"call{n}"}]),
+            ToolMessage("result", tool_call_id=f"call{n}", id=f"t{n}"),
+        ]
+    return messages + [AIMessage(f"answer {n}", id=f"a{n}")]
+
+
+def test_keeps_the_final_answer_of_the_last_turn(summarizer):
+    messages = _turn(1) + _turn(2) + _turn(3)
+
+    result = summarizer.summarize_conversation(
+        {"messages": messages}, max_tokens=3, token_counter=_one_token_each
+    )
+
+    assert [m.id for m in result["messages"]] == ["h3", "a3"]
+    assert result["messages"][-1].content == "answer 3"
+    assert [m.id for m in summarizer.fake_model.inputs[0][:-1]] == ["h1", "a1", "h2", "a2"]
+
+
+def test_never_separates_tool_results_from_their_call(summarizer):
+    messages = _turn(1) + _turn(2, tool=True) + _turn(3, tool=True)
+
+    result = summarizer.summarize_conversation(
+        {"messages": messages}, max_tokens=2, token_counter=_one_token_each
+    )
+
+    # The last turn is kept whole even though it exceeds the budget
+    assert [m.id for m in result["messages"]] == ["h3", "c3", "t3", "a3"]
+
+
+def test_keeps_whole_earlier_turns_that_fit(summarizer):
+    messages = _turn(1, tool=True) + _turn(2, tool=True) + _turn(3)
+
+    cut = summarizer.recent_turns_start(messages, max_tokens=6, token_counter=_one_token_each)
+
+    assert messages[cut].id == "h2"
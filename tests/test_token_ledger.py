@@ -0,0 +1,61 @@
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from src.core import token_ledger
+from src.core.token_ledger import count_cached, remove_from_ledger, update_ledger
+
+
+def _history(n):
+    messages = []
+    for i in range(n):
+        messages += [HumanMessage(f"question {i}", id=f"h{i}"), AIMessage(f"answer {i}", id=f"a{i}")]
+    return messages
+
+
+def test_ledger_stays_the_same_size_as_history_grows():
+    messages = _history(2)
+    ledger = update_ledger(None, messages)
+    messages += _history(50)[4:]
+    ledger = update_ledger(ledger, messages)
+
+    assert set(ledger) == {"last", *token_ledger.TOTALS}
+    assert ledger["last"] == messages[-1].id
+    assert ledger["history"] == count_cached(messages)
+
+
+def test_only_new_messages_are_counted(monkeypatch):
+    messages = _history(2)
+    ledger = update_ledger(None, messages)
+    counted = []
+    original = token_ledger.message_tokens
+    monkeypatch.setattr(
+        token_ledger, "message_tokens", lambda m: counted.append(m.id) or original(m)
+    )
+
+    messages.append(ToolMessage("result", tool_call_id="call", id="t0"))
+    ledger = update_ledger(ledger, messages)
+
+    assert counted == ["t0"]
+    assert ledger["tool"] == ledger["history"] - count_cached(messages[:-1])
+
+
+def test_removing_messages_subtracts_their_counts():
+    messages = _history(3)
+    ledger = update_ledger(None, messages)
+
+    ledger = remove_from_ledger(ledger, messages[:2])
+
+    assert ledger["history"] == count_cached(messages[2:])
+
+
+def test_old_format_ledger_is_rebuilt():
+    messages = _history(2)
+    old = {"messages": {"h0": [5, 0, 0]}, "history": 5, "tool": 0, "images": 0, "summary": 3, "system": 7}
+
+    ledger = update_ledger(old, messages)
+
+    assert "messages" not in ledger
+    assert ledger["history"] == count_cached(messages)
@@ -0,0 +1,33 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from src.audio import vad_engine
+from src.config import config
+
+
+def test_missing_onnx_model_falls_back_to_torch(monkeypatch):
+    monkeypatch.setattr(vad_engine, "find_onnx_model", lambda: None)
+
+    class FakeTorchBackend:
+        name = "torch"
+
+        def __init__(self, sample_rate):
+            self.sample_rate = sample_rate
+
+    monkeypatch.setattr(vad_engine, "TorchSileroBackend", FakeTorchBackend)
+
+    engine = vad_engine.VADEngine(backend="onnx")
+
+    assert engine.backend.name == "torch"
+
+
+def test_finds_model_in_a_torch_hub_checkout(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "VAD_ONNX_MODEL", str(tmp_path / "missing.onnx"))
+    monkeypatch.setattr(config, "SILERO_VAD_REPO", str(tmp_path / "repo"))
+    monkeypatch.setattr(config, "TORCH_HUB_DIR", str(tmp_path / "hub"))
+    model = tmp_path / "hub" / "snakers4_silero-vad_master" / "src" / "silero_vad" / "data" / "silero_vad.onnx"
+    model.parent.mkdir(parents=True)
+    model.write_bytes(b"")
+
+    assert vad_engine.find_onnx_model() == str(model)
@@ -0,0 +1,60 @@
+import sys
+import types
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.audio.voiceprint import VoicePrintStore
+
+
+class _Encoder:
+    """Embeds a recording as its first bytes, so different files get different prints."""
+
+    def embed_utterance(self, wav):
+        return np.frombuffer(wav[:8].ljust(8, b"\0"), dtype=np.uint8).astype(np.float32) + 1
+
+
+@pytest.fixture(autouse=True)
+def fake_resemblyzer(monkeypatch):
+    module = types.SimpleNamespace(preprocess_wav=lambda path: open(path, "rb").read())
+    monkeypatch.setitem(sys.modules, "resemblyzer", module)
+
+
+def test_replaced_recording_replaces_its_voice_print(tmp_path):
+    store_path = tmp_path / "voiceprints.npz"
+    owner = tmp_path / "owner.wav"
+    owner.write_bytes(b"old voice")
+    store = VoicePrintStore(str(store_path), dim=8)
+    assert store.enroll("owner", str(owner), _Encoder())
+
+    owner.write_bytes(b"new voice")
+    store = VoicePrintStore(str(store_path), dim=8)
+    assert store.enroll("owner", str(owner), _Encoder())
+
+    reloaded = VoicePrintStore(str(store_path), dim=8)
+    assert len(reloaded) == 1
+    new_print = _Encoder().embed_utterance(b"new voice")
+    assert reloaded.match(new_print)[1] == pytest.approx(1.0)
+
+
+def test_unchanged_recording_is_not_embedded_again(tmp_path):
+    owner = tmp_path / "owner.wav"
+    owner.write_bytes(b"voice")
+    store = VoicePrintStore(str(tmp_path / "voiceprints.npz"), dim=8)
+
+    assert store.enroll("owner", str(owner), _Encoder())
+    assert not store.enroll("owner", str(owner), _Encoder())
+    assert len(store) == 1
+
+
+def test_other_samples_are_kept(tmp_path):
+    store = VoicePrintStore(str(tmp_path / "voiceprints.npz"), dim=8)
+    for name in ("owner.wav", "owner_1.wav"):
+        (tmp_path / name).write_bytes(name.encode())
+        store.enroll("owner", str(tmp_path / name), _Encoder())
+
+    (tmp_path / "owner.wav").write_bytes(b"re-recorded")
+    store.enroll("owner", str(tmp_path / "owner.wav"), _Encoder())
+
+    assert len(store) == 2